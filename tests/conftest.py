@@ -0,0 +1,51 @@
+from functools import cache
+from pathlib import Path
+import random
+from typing import Callable, List, NamedTuple, Tuple
+
+import pytest
+
+from wordle.candidates import CandidateIndex
+from wordle.feedback import FeedbackMatrix
+from wordle.lib import load_words
+
+WORDLIST = Path(__file__).parent.parent / "wordlist.csv"
+
+
+class Sample(NamedTuple):
+    words: List[str]
+    feedback: FeedbackMatrix
+
+
+@cache
+def _wordlist() -> Tuple[str, ...]:
+    return tuple(load_words(WORDLIST))
+
+
+# a sorted random sample of the word list, plus any extra words, and its feedback matrix;
+# each is built once per session, the first time a test asks for it
+@cache
+def _sample(seed: int, size: int, extra: Tuple[str, ...] = ()) -> Sample:
+    words = sorted(set(random.Random(seed).sample(_wordlist(), size)).union(extra))
+    return Sample(words, FeedbackMatrix.build(words))
+
+
+# an index only caches partitions and compatibility graphs, so tests can share one
+@cache
+def _sample_index(seed: int, size: int) -> CandidateIndex:
+    return CandidateIndex(*_sample(seed, size))
+
+
+@pytest.fixture(scope="session")
+def wordlist() -> List[str]:
+    return list(_wordlist())
+
+
+@pytest.fixture(scope="session")
+def sample() -> Callable[..., Sample]:
+    return _sample
+
+
+@pytest.fixture(scope="session")
+def sample_index() -> Callable[[int, int], CandidateIndex]:
+    return _sample_index
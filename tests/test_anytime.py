@@ -0,0 +1,40 @@
+from wordle.anytime import AnytimeSearch
+from wordle.candidates import CandidateIndex
+from wordle.search import BitsetSearch
+from wordle.validate import Validator
+
+
+def test_anytime_search_reaches_the_exact_longest_chain(sample):
+    words, feedback = sample(0, 30)
+    index = CandidateIndex(words, feedback)
+    longest = max(len(BitsetSearch(index).solve(target)) for target in words)
+    found = list()
+    search = AnytimeSearch(index, seed=0, width=2)
+
+    chain = search.run(words, 60, found.append)
+    assert search.complete
+    assert len(chain) == longest
+    assert [len(c) for c in found] == sorted({len(c) for c in found})
+    validator = Validator(feedback)
+    for c in found:
+        assert validator.check(list(reversed(c))) is None
+
+
+def test_anytime_search_stops_at_the_deadline(sample):
+    words, feedback = sample(0, 30)
+    search = AnytimeSearch(CandidateIndex(words, feedback), seed=0)
+    chain = search.run(words, 0)
+    assert search.rounds == 0
+    assert chain == []
+
+
+def test_anytime_beam_spreads_across_patterns(sample):
+    words, feedback = sample(0, 30)
+    search = AnytimeSearch(CandidateIndex(words, feedback), seed=0)
+    scored = [(10.0, 1, (0, 0b1, (1,))), (9.0, 1, (0, 0b10, (2,))), (8.0, 2, (0, 0b100, (3,)))]
+    selected, kept = search._select(list(scored), 8)
+    assert [state[2] for state in selected] == [(1,), (3,)]
+    assert not kept
+    selected, kept = search._select(list(scored), 12)
+    assert [state[2] for state in selected] == [(1,), (3,), (2,)]
+    assert kept
@@ -0,0 +1,24 @@
+from wordle.benchmark import compare, run_suite, uncovered
+
+
+def test_suite_covers_engine_and_flags_regressions(wordlist):
+    suite = run_suite(wordlist, [20], seed=0, repeat=1, games=2, solve_targets=1, solve_limit=30)
+    assert {name.split("[")[0] for name in suite["results"]} == {
+        "_make_guess",
+        "is_legal",
+        "copy_make_guess",
+        "exhaustive_guess",
+        "legal_hard_mode_guess",
+        "worst_solve_set",
+        "worst_solve_bitset",
+    }
+
+    slower = {"results": {name: dict(result, ns_per_op=result["ns_per_op"] * 2) for name, result in suite["results"].items()}}
+    comparisons, regressions = compare(suite, slower, threshold=0.1)
+    assert len(comparisons) == len(regressions) == len(suite["results"])
+    assert not compare(slower, suite, threshold=0.1)[1]
+    # worst_solve is always benchmarked, on its own sub-wordlist
+    assert {"worst_solve_set[30]", "worst_solve_bitset[30]"} <= set(suite["results"])
+    assert not uncovered(suite, slower)
+    older = {"results": {name: result for name, result in suite["results"].items() if not name.startswith("worst_solve")}}
+    assert uncovered(older, suite) == ["worst_solve_set[30]", "worst_solve_bitset[30]"]
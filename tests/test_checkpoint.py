@@ -0,0 +1,38 @@
+from wordle.checkpoint import Checkpoint, FrameWriter
+from wordle.scheduler import Task
+from wordle.search import BitsetSearch, Frame
+
+
+def test_resume_from_saved_frames(sample_index):
+    index = sample_index(2, 40)
+    words = index.words
+    search = BitsetSearch(index)
+    search.checkpoint_interval = 3
+    for target in words[:10]:
+        snapshots = list()
+        expected = search.solve(target, on_checkpoint=lambda frames: snapshots.append([f.to_dict() for f in frames]))
+        for snapshot in snapshots:
+            resumed = search.solve(target, frames=[Frame.from_dict(frame) for frame in snapshot])
+            assert len(resumed) == len(expected)
+
+
+def test_checkpoint_round_trip(tmp_path, sample_index):
+    index = sample_index(2, 40)
+    words = index.words
+    path = tmp_path / "checkpoint.json"
+    task = Task(words[0], (words[1],), 10)
+    checkpoint = Checkpoint(path, "digest", interval=0)
+    checkpoint.complete(task, [words[0], words[1]])
+
+    writer = FrameWriter(path, "digest", interval=0)
+    in_progress = Task(words[2], (), len(words))
+    writer.start(in_progress)
+    writer([Frame(index.all, 0, [(3, 5)], position=1, worst_guesses=[2, 3], upper=4)])
+
+    loaded = Checkpoint.load(path, "digest", interval=0)
+    assert loaded.completed == {(words[0], (words[1],)): [words[0], words[1]]}
+    assert loaded.frames[(words[2], ())][0].worst_guesses == [2, 3]
+    assert loaded.best_length == 2
+
+    writer.finish()
+    assert not Checkpoint.load(path, "digest", interval=0).frames
@@ -0,0 +1,61 @@
+from pathlib import Path
+import pickle
+
+from wordle.compiled import CompiledWordlist
+from wordle.index import LetterIndex
+from wordle.lib import load_words
+from wordle.wordle import Wordle
+
+wordlist = Path(__file__).parent.parent / "wordlist.csv"
+
+
+def test_compiled_wordlist_matches_source(tmp_path):
+    compiled = CompiledWordlist.load(wordlist, tmp_path)
+    words = load_words(wordlist)
+    assert compiled.words == words
+    assert compiled.ids[words[97]] == 97
+    assert pickle.loads(pickle.dumps(compiled)) is compiled
+
+
+def test_compiled_wordlist_is_recompiled_when_source_changes(tmp_path):
+    source = tmp_path / "words.csv"
+    source.write_text("CRANE\nSLATE\n")
+    assert CompiledWordlist.load(source, tmp_path).words == ["crane", "slate"]
+
+    source.write_text("CRANE\nSLATE\nTRACE\n")
+    assert CompiledWordlist.load(source, tmp_path).words == ["crane", "slate", "trace"]
+
+
+def test_compiled_wordlist_replaces_older_versions(tmp_path):
+    source = tmp_path / "words.csv"
+    source.write_text("CRANE\nSLATE\n")
+    CompiledWordlist.path_for(source, tmp_path).write_bytes(b"EWLC\x01")
+    assert CompiledWordlist.load(source, tmp_path).words == ["crane", "slate"]
+
+
+def test_same_named_wordlists_get_their_own_artifacts(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "words.csv").write_text("CRANE\nSLATE\n")
+    (tmp_path / "b" / "words.csv").write_text("TRACE\n")
+    assert CompiledWordlist.load(tmp_path / "a" / "words.csv", tmp_path).words == ["crane", "slate"]
+    assert CompiledWordlist.load(tmp_path / "b" / "words.csv", tmp_path).words == ["trace"]
+    assert CompiledWordlist.load(tmp_path / "a" / "words.csv", tmp_path).words == ["crane", "slate"]
+    assert len(list(tmp_path.glob("words-*.bin"))) == 2
+
+
+def test_compiled_letter_index_matches_a_built_one(tmp_path):
+    source = tmp_path / "words.csv"
+    source.write_text("CRANE\nSLATE\nGEESE\nABATE\n")
+    compiled = CompiledWordlist.load(source, tmp_path).letter_index()
+    built = LetterIndex(compiled.words)
+    assert compiled.positions == built.positions
+    assert compiled.exactly == built.exactly
+    assert compiled.at_least == built.at_least
+
+    index = CompiledWordlist.load(wordlist, tmp_path).letter_index()
+    for target, guess in [("abate", "abbey"), ("geese", "eerie"), ("crane", "slate")]:
+        wordle = Wordle(target, True)
+        wordle.make_guess(guess)
+        expected = [word for word in index.words if wordle.is_legal(word)]
+        assert index.to_words(index.candidates(wordle.constraints)) == expected
@@ -0,0 +1,94 @@
+from multiprocessing import Pool, Process
+import os
+from pathlib import Path
+import time
+
+from wordle.distributed import WorkQueue, _Heartbeat, work
+from wordle.scheduler import split
+from wordle.search import BitsetSearch
+
+
+def crash(path):
+    # claims a task and dies without finishing it or releasing its lease
+    WorkQueue(path, 1.0).claim("crashed")
+    os._exit(1)
+
+
+def run_worker(args):
+    path, worker = args
+    return work(path, worker, path / "cache", lease_seconds=1.0, table_size=0, poll_interval=0.05)
+
+
+def test_workers_share_a_queue_and_take_over_expired_leases(tmp_path, sample_index):
+    search = BitsetSearch(sample_index(2, 25))
+    words = search.index.words
+    queue = WorkQueue.create(tmp_path / "queue", words, split(search, words[:6], 1), branch_and_bound=False, lease_seconds=1.0)
+    crashed = Process(target=crash, args=(queue.path,))
+    crashed.start()
+    crashed.join()
+    first, _ = queue.tasks()[0]
+    assert queue.status()["leased"] == 1
+    # a live lease can't be claimed out from under its worker
+    other, _ = queue.claim("other")
+    assert other != first
+    assert queue._take_lease(first, "other") is False
+
+    with Pool(3) as pool:
+        finished = pool.map(run_worker, [(queue.path, f"worker-{i}") for i in range(3)])
+
+    # both abandoned leases expired and were taken over
+    assert sum(finished) == len(queue.tasks())
+    assert queue.status()["done"] == len(queue.tasks())
+    assert queue.results()[first]["worker"].startswith("worker-")
+    assert queue.results()[other]["worker"].startswith("worker-")
+    chains = {target: chain for target, chain, _ in WorkQueue(queue.path).merge()}
+    assert set(chains) == set(words[:6])
+    for target, chain in chains.items():
+        assert len(chain) == len(search.solve(target))
+        assert chain[0] == target
+
+
+def test_lease_expires_without_heartbeats(tmp_path, sample_index):
+    search = BitsetSearch(sample_index(2, 25))
+    words = search.index.words
+    queue = WorkQueue.create(tmp_path / "queue", words, split(search, words[:1], 0), branch_and_bound=False, lease_seconds=30.0)
+    name, _ = queue.claim("first")
+    assert queue.claim("second") is None
+
+    lease = queue.leases_dir / f"{name}.json"
+    os.utime(lease, (time.time() - 60, time.time() - 60))
+    assert queue.status()["expired"] == 1
+    assert queue.claim("second") == (name, queue.tasks()[0][1])
+    assert lease.read_text() == "second"
+
+
+def test_heartbeat_outlives_a_missing_lease(tmp_path, sample_index):
+    search = BitsetSearch(sample_index(2, 25))
+    words = search.index.words
+    queue = WorkQueue.create(tmp_path / "queue", words, split(search, words[:1], 0), branch_and_bound=False, lease_seconds=0.3)
+    name, _ = queue.claim("worker")
+    lease = queue.leases_dir / f"{name}.json"
+    aside = lease.with_name("aside")
+    with _Heartbeat(queue, name):
+        # moved aside for a couple of heartbeats, the way a worker checking it would
+        os.rename(lease, aside)
+        time.sleep(0.25)
+        os.utime(aside, (time.time() - 60, time.time() - 60))
+        os.rename(aside, lease)
+        time.sleep(0.25)
+        assert not queue._expired(lease)
+
+
+def test_claims_skip_finished_tasks_without_checking_them_again(tmp_path, monkeypatch, sample_index):
+    search = BitsetSearch(sample_index(2, 25))
+    words = search.index.words
+    queue = WorkQueue.create(tmp_path / "queue", words, split(search, words[:3], 1), branch_and_bound=False)
+    for _ in range(5):
+        name, task = queue.claim("worker")
+        queue.complete(name, task, [], "worker", 0.0)
+    checked = list()
+    exists = Path.exists
+    monkeypatch.setattr(Path, "exists", lambda path: checked.append(path.name) or exists(path))
+    queue.claim("worker")
+    # only the task it claims, once before and once after taking its lease
+    assert set(checked) == {f"{queue.tasks()[5][0]}.json"}
@@ -0,0 +1,63 @@
+import pickle
+
+from wordle.feedback import FeedbackMatrix, decode, encode, score, score_rows, all_correct_code
+from wordle.wordle import Wordle, CharResult
+
+vocabulary = ["ABATE", "ABBEY", "AGORA", "ERROR", "FLAKE", "LATER", "METER", "ROVER"]
+
+
+def test_score_matches_wordle():
+    for guess in vocabulary:
+        for target in vocabulary:
+            expected = Wordle(target).make_guess(guess)
+            assert decode(score(guess, target), len(target)) == tuple(expected)
+
+
+def test_encode_decode():
+    results = [CharResult.Green, CharResult.Gray, CharResult.Yellow, CharResult.Gray, CharResult.Green]
+    assert list(decode(encode(results), len(results))) == results
+    assert encode([CharResult.Green] * 5) == all_correct_code(5)
+
+
+def test_load_and_pickle(tmp_path):
+    built = FeedbackMatrix.load(vocabulary, tmp_path)
+    loaded = FeedbackMatrix.load(vocabulary, tmp_path)
+    assert loaded.words == vocabulary
+    assert list(loaded.row(3)) == list(built.row(3))
+    assert CharResult.to_string(loaded.results("ERROR", "ROVER")) == "YYXYG"
+
+    unpickled = pickle.loads(pickle.dumps(loaded))
+    assert unpickled.pattern("FLAKE", "ABATE") == loaded.pattern("FLAKE", "ABATE")
+
+
+def test_wordle_uses_feedback():
+    feedback = FeedbackMatrix.build(vocabulary)
+    w = Wordle("ABATE", True, feedback)
+
+    assert CharResult.to_string(w.make_guess("ABBEY")) == "GGXYX"
+    c, result = w.copy_make_guess("ABATE")
+    assert CharResult.all_correct(result)
+
+
+def test_score_rows_match_score_at_every_length(tmp_path):
+    for words in (vocabulary, ["BANANA", "BANDIT", "CANNON", "NATION", "ANNALS"]):
+        assert list(score_rows(words, 0, len(words))) == [score(guess, target) for guess in words for target in words]
+
+    six_letters = ["BANANA", "BANDIT", "CANNON", "NATION", "ANNALS"]
+    FeedbackMatrix.write(six_letters, tmp_path / "six.bin", chunk_rows=2)
+    loaded = FeedbackMatrix.open(tmp_path / "six.bin")
+    assert loaded.pattern("NATION", "CANNON") == score("NATION", "CANNON") > 0xFF
+    assert pickle.loads(pickle.dumps(FeedbackMatrix.build(six_letters))).row(2).tolist() == loaded.row(2).tolist()
+
+
+def test_scores_and_codes_match_results():
+    matrix = FeedbackMatrix.build(vocabulary)
+    for guess_id, guess in enumerate(vocabulary):
+        assert list(matrix.scores(guess_id)) == list(matrix.row(guess_id))
+        assert list(matrix.scores(guess_id, [4, 1])) == [matrix.code(guess_id, 4), matrix.code(guess_id, 1)]
+        assert list(matrix.scores(guess_id, [2])) == [matrix.code(guess_id, 2)]
+        for target in vocabulary:
+            wordle = Wordle(target)
+            results = wordle.make_guess(guess)
+            assert CharResult.to_code(results) == wordle.score(guess) == matrix.pattern(guess, target)
+            assert CharResult.from_code(wordle.score(guess), len(target)) == tuple(results)
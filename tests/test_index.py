@@ -0,0 +1,25 @@
+import random
+
+from wordle.index import LetterIndex
+from wordle.wordle import Wordle
+
+
+def test_candidates_match_constraint_scan(wordlist):
+    index = LetterIndex(wordlist)
+    rng = random.Random(4)
+    for _ in range(20):
+        wordle = Wordle(rng.choice(wordlist), True)
+        for _ in range(3):
+            guess = rng.choice(index.to_words(index.candidates(wordle.constraints)))
+            wordle.make_guess(guess)
+            expected = [word for word in wordlist if wordle.constraints.is_legal(word)]
+            assert index.to_words(index.candidates(wordle.constraints)) == expected
+
+
+def test_is_legal_matches_wordle(wordlist):
+    index = LetterIndex(wordlist)
+    w = Wordle("abate", True)
+    w.make_guess("abbey")
+    for word in ("agora", "aback", "abate"):
+        assert index.is_legal(w.constraints, word) == w.is_legal(word)
+    assert index.is_legal(w.constraints, "abate")
@@ -0,0 +1,16 @@
+import json
+
+import pytest
+
+from wordle.lib import atomic_write, write_json
+
+
+def test_atomic_write_keeps_the_old_file_until_complete(tmp_path):
+    path = tmp_path / "data.json"
+    write_json(path, {"a": 1})
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write(b"{")
+            raise RuntimeError("interrupted")
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert list(tmp_path.iterdir()) == [path]
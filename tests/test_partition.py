@@ -0,0 +1,17 @@
+from wordle.partition import PartitionSearch
+from wordle.search import BitsetSearch
+from wordle.transposition import TranspositionTable
+
+
+def test_shared_search_matches_per_target_search(sample_index):
+    index = sample_index(3, 40)
+    words = index.words
+    per_target = BitsetSearch(index)
+    shared = PartitionSearch(index, TranspositionTable(1000))
+    chains = shared.solve()
+
+    assert set(chains) == set(words)
+    for target, chain in chains.items():
+        assert chain[0] == target
+        assert len(chain) == len(per_target.solve(target))
+    assert len(shared.longest()) == max(len(chain) for chain in chains.values())
@@ -0,0 +1,18 @@
+from wordle.results import ResultsFile
+
+
+def test_results_file_resumes_and_drops_partial_lines(tmp_path):
+    path = tmp_path / "results.jsonl"
+    results = ResultsFile(path, "run")
+    results.write("tiger", ["tiger", "tower", "track"], 0.5)
+    results.write("crane", ["crane"], 0.1)
+    results.close()
+    other = ResultsFile(path, "other")
+    other.write("slate", ["slate"], 0.1)
+    other.close()
+    with path.open("a") as f:
+        f.write('{"run": "run", "tar')
+
+    assert ResultsFile(path, "run").load() == {"tiger": ["tiger", "tower", "track"], "crane": ["crane"]}
+    assert path.read_text().endswith("\n")
+    assert list(ResultsFile(path, "other").load()) == ["slate"]
@@ -0,0 +1,72 @@
+from dataclasses import replace
+from functools import partial
+from multiprocessing import Pool
+
+from wordle.candidates import CandidateIndex
+from wordle.eldrow import TaskContext, _init_worker, run_task
+from wordle.scheduler import merge, schedule, split
+from wordle.search import BitsetSearch
+
+
+def run(search, task):
+    return task, search.solve(task.target, task.prefix)
+
+
+def test_split_tasks_cover_each_target(sample_index):
+    search = BitsetSearch(sample_index(1, 25))
+    words = search.index.words
+    tasks = split(search, words, 1)
+    assert {task.target for task in tasks} == set(words)
+    assert all(len(task.prefix) == 1 for task in tasks)
+
+    merged = dict(merge(tasks, schedule(tasks, partial(run, search))))
+    for target in words:
+        assert len(merged[target]) == len(search.solve(target))
+        assert merged[target][0] == target
+
+
+def test_pool_schedule(sample_index):
+    search = BitsetSearch(sample_index(1, 25))
+    words = search.index.words
+    tasks = split(search, words[:5], 2)
+    with Pool(2) as pool:
+        merged = dict(merge(tasks, schedule(tasks, partial(run, search), pool)))
+    for target in words[:5]:
+        assert len(merged[target]) == len(search.solve(target))
+
+
+def test_split_skips_duplicate_and_dominated_guesses(sample_index):
+    search = BitsetSearch(sample_index(1, 25))
+    words = search.index.words
+    plain = BitsetSearch(search.index, dominance=False)
+    for target in words[:5]:
+        expanded = search.expand(target)
+        assert len(expanded) < len(plain.expand(target))
+        assert [size for _, size in expanded] == sorted((size for _, size in expanded), reverse=True)
+        sets = [search.candidates(search.index.ids[target], (guess,)) for guess, _ in expanded]
+        assert not any(a | b == b for i, a in enumerate(sets) for j, b in enumerate(sets) if i != j)
+
+
+def test_run_task_skips_tasks_that_cant_beat_their_target(sample):
+    words, feedback = sample(1, 25)
+    search = BitsetSearch(CandidateIndex(words, feedback))
+    tasks = split(search, words[:5], 1)
+    _init_worker(None, TaskContext(tuple(words), feedback, 0))
+    try:
+        results = [run_task(task) for task in tasks]
+        merged = dict(merge(tasks, ((task, chain) for task, chain, _, _ in results)))
+        for target in words[:5]:
+            assert len(merged[target]) == len(search.solve(target))
+
+        # a task whose prefix and candidates together are no longer than its target's best is skipped
+        task = tasks[0]
+        small = replace(task, size=len(merged[task.target]) - len(task.prefix))
+        _, chain, stats, _ = run_task(small)
+        assert chain == []
+        assert stats.prunes["siblings"] == 1
+
+        # and a new run starts over
+        _init_worker(None, TaskContext(tuple(words), feedback, 0))
+        assert run_task(small)[1]
+    finally:
+        _init_worker(None)
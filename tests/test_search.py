@@ -0,0 +1,128 @@
+from wordle.candidates import CandidateIndex
+from wordle.eldrow import TaskContext, _init_worker, solve_target_id, worst_solve
+from wordle.search import BitsetSearch, GlobalBest
+from wordle.stats import SearchStats
+from wordle.transposition import TranspositionTable
+from wordle.wordle import Wordle, CharResult
+
+
+def verify_chain(chain):
+    wordle = Wordle(chain[0], True)
+    for guess in reversed(chain[1:]):
+        assert not CharResult.all_correct(wordle.make_guess(guess))
+    assert CharResult.all_correct(wordle.make_guess(chain[0]))
+
+
+def test_bitset_matches_set_engine(sample):
+    words, feedback = sample(0, 30)
+    search = BitsetSearch(CandidateIndex(words, feedback))
+    for target in words[:10]:
+        expected = worst_solve(Wordle(target, True), set(words))
+        chain = search.solve(target)
+        assert len(chain) == len(expected)
+        verify_chain(chain)
+
+
+def test_consistent_masks_match_is_legal(sample):
+    words, feedback = sample(0, 30)
+    index = CandidateIndex(words, feedback)
+    for guess in words[:5]:
+        for target in words[5:10]:
+            wordle, _ = Wordle(target, True).copy_make_guess(guess)
+            child = index.child(index.all, index.ids[guess], index.ids[target])
+            assert index.to_words(child) == [word for word in words if wordle.is_legal(word)]
+
+
+def test_transposition_table_preserves_results(sample):
+    words, feedback = sample(0, 30)
+    table = TranspositionTable(1000)
+    search = BitsetSearch(CandidateIndex(words, feedback), table)
+    plain = BitsetSearch(CandidateIndex(words, feedback))
+    for target in words:
+        assert len(search.solve(target)) == len(plain.solve(target))
+    assert table.stats.hits > 0
+
+
+def test_branch_and_bound_finds_longest_chain(sample):
+    words, feedback = sample(0, 30)
+    plain = BitsetSearch(CandidateIndex(words, feedback))
+    expected = max(len(plain.solve(target)) for target in words)
+
+    best = GlobalBest()
+    search = BitsetSearch(CandidateIndex(words, feedback), TranspositionTable(1000), best)
+    chains = [search.solve(target) for target in words]
+    assert max(len(chain) for chain in chains) == expected == best.length
+    for chain in chains:
+        if chain:
+            verify_chain(chain)
+
+
+def test_upper_bound_is_admissible(sample):
+    words, feedback = sample(0, 30)
+    index = CandidateIndex(words, feedback)
+    search = BitsetSearch(index)
+    for target in words:
+        assert index.upper_bound(index.all, index.ids[target]) >= len(search.solve(target))
+
+
+def test_search_stats_count_the_tree(sample):
+    words, feedback = sample(0, 30)
+    search = BitsetSearch(CandidateIndex(words, feedback), TranspositionTable(1000))
+    for target in words[:5]:
+        search.solve(target)
+
+    stats = search.stats.take()
+    assert stats.nodes[0] == 5
+    assert stats.total_nodes == sum(stats.child_sizes.values()) - stats.leaves - stats.table_hits + 5
+    assert set(stats.time_ns) == set(stats.nodes)
+    assert search.stats.total_nodes == 0
+
+    stats.merge(stats)
+    assert stats.nodes[0] == 10
+
+
+def test_set_engine_counts_the_same_stats(sample):
+    words = sample(0, 30).words
+    stats = SearchStats()
+    table = TranspositionTable(1000)
+    for target in words[:5]:
+        worst_solve(Wordle(target, True), set(words), table=table, stats=stats)
+
+    assert stats.nodes[0] == 5
+    assert stats.total_nodes == sum(stats.child_sizes.values()) - stats.leaves - stats.table_hits + 5
+    assert set(stats.time_ns) == set(stats.nodes)
+    assert stats.prunes["siblings"] > 0
+
+
+def test_dominance_pruning_preserves_results(sample):
+    words, feedback = sample(0, 30)
+    index = CandidateIndex(words, feedback)
+    pruned = BitsetSearch(index)
+    full = BitsetSearch(index, dominance=False)
+    for target in words:
+        assert len(pruned.solve(target)) == len(full.solve(target))
+    assert pruned.stats.prunes["duplicate"] + pruned.stats.prunes["dominated"] > 0
+    assert pruned.stats.total_nodes < full.stats.total_nodes
+
+
+def test_set_engine_dominance_pruning_preserves_results(sample):
+    words = sample(0, 30).words
+    pruned, full = SearchStats(), SearchStats()
+    for target in words[:10]:
+        expected = worst_solve(Wordle(target, True), set(words), stats=full, dominance=False)
+        assert len(worst_solve(Wordle(target, True), set(words), stats=pruned)) == len(expected)
+    assert pruned.prunes["duplicate"] + pruned.prunes["dominated"] > 0
+    assert pruned.total_nodes < full.total_nodes
+
+
+def test_solve_target_id_sends_word_ids(sample):
+    words, feedback = sample(0, 30)
+    _init_worker(None, TaskContext(tuple(words), feedback, 0))
+    try:
+        search = BitsetSearch(CandidateIndex(words, feedback))
+        for target_id in range(5):
+            returned_id, chain, _, _ = solve_target_id(target_id)
+            assert returned_id == target_id
+            assert [words[i] for i in chain] == search.solve(words[target_id])
+    finally:
+        _init_worker(None)
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+from wordle.candidates import CandidateIndex
+from wordle.search import BitsetSearch
+from wordle.service import Service
+from wordle.wordle import Wordle
+
+
+def run_service(words, feedback, lines, **kwargs):
+    async def run():
+        service = Service(words, feedback, processes=1, **kwargs)
+        reader = asyncio.StreamReader()
+        reader.feed_data("".join(f"{line}\n" for line in lines).encode())
+        reader.feed_eof()
+        written = list()
+
+        async def write(text):
+            written.append(json.loads(text))
+
+        try:
+            await service.serve(reader, write)
+        finally:
+            service.close()
+        return {response.get("id"): response for response in written}
+
+    return asyncio.run(run())
+
+
+def test_service_answers_each_op(sample):
+    words, feedback = sample(0, 30)
+    target, guess = words[0], words[1]
+    wordle = Wordle(target, True)
+    result = wordle.make_guess(guess)
+    legal = [word for word in words if wordle.is_legal(word)]
+    chain = BitsetSearch(CandidateIndex(words, feedback)).solve(target)
+
+    responses = run_service(
+        words,
+        feedback,
+        [
+            json.dumps({"id": 1, "op": "score", "guess": guess, "target": target}),
+            json.dumps({"id": 2, "op": "legal", "target": target, "guesses": [guess]}),
+            json.dumps({"id": 3, "op": "legal", "history": [[guess, "".join(r.value for r in result)]]}),
+            json.dumps({"id": 4, "op": "worst_solve", "target": target}),
+            json.dumps({"id": 5, "op": "score", "guess": "ab", "target": target}),
+            json.dumps({"id": 6, "op": "dance"}),
+            "not json",
+        ]
+    )
+
+    assert responses[1]["result"] == "".join(r.value for r in result)
+    assert responses[2]["words"] == legal
+    assert responses[3]["words"] == legal
+    assert responses[4]["length"] == len(chain)
+    assert responses[4]["chain"][-1] == target
+    assert "error" in responses[5]
+    assert "error" in responses[6]
+    assert "error" in responses[None]
+
+
+def test_service_refuses_large_searches(sample):
+    words, feedback = sample(0, 30)
+    responses = run_service(words, feedback, [json.dumps({"id": 1, "op": "worst_solve", "target": words[0]})], max_candidates=5)
+    assert "more than this service searches" in responses[1]["error"]
+
+
+def test_service_answers_bad_requests_with_errors(sample):
+    words, feedback = sample(0, 30)
+    responses = run_service(
+        words,
+        feedback,
+        [
+            json.dumps({"id": 1, "op": "legal", "history": [["aaaaa", "XXXXX"], ["aaaaa", "GXXXX"]]}),
+            json.dumps({"id": 2, "op": "score", "guess": 5, "target": words[0]}),
+            json.dumps({"id": 3, "op": "legal", "history": [["track", "GYXXX"], ["tower", "GXXGG"]]}),
+        ]
+    )
+    assert "contradicts the earlier results" in responses[1]["error"]
+    assert "AttributeError" in responses[2]["error"]
+    assert "error" not in responses[3]
+
+
+def test_service_rejects_illegal_prefixes(sample):
+    words, feedback = sample(0, 30, ("dirty", "tiger", "timer", "track"))
+    responses = run_service(
+        words,
+        feedback,
+        [
+            json.dumps({"id": 1, "op": "worst_solve", "target": "tiger", "guesses": ["track", "dirty"]}),
+            json.dumps({"id": 2, "op": "worst_solve", "target": "tiger", "guesses": ["track", "tiger"]}),
+            json.dumps({"id": 3, "op": "worst_solve", "target": "tiger", "guesses": ["tiger", "track"]}),
+            json.dumps({"id": 4, "op": "worst_solve", "target": "tiger", "guesses": ["track"]}),
+        ],
+    )
+    assert "guess 2 ('dirty') is not legal" in responses[1]["error"]
+    assert "guess 2 is the target" in responses[2]["error"]
+    assert "guess 1 is the target" in responses[3]["error"]
+    assert responses[4]["chain"][0] == "track"
+    assert responses[4]["chain"].count("tiger") == 1
@@ -0,0 +1,28 @@
+from wordle.simulate import simulate
+
+
+def test_simulation_is_reproducible_across_processes(sample):
+    words, feedback = sample(0, 60)
+    serial = simulate(words, ["exhaustive_guess", "legal_hard_mode_guess"], [0, 1], feedback=feedback, batch_size=16)
+    parallel = simulate(words, ["exhaustive_guess", "legal_hard_mode_guess"], [0, 1], processes=2, feedback=feedback, batch_size=16)
+
+    for strategy, report in serial.items():
+        assert report.games == 2 * len(words)
+        assert report.distribution == parallel[strategy].distribution
+        assert 1 <= report.mean <= report.worst <= len(words)
+        assert sum(games for _, _, games in report.histogram()) == report.games
+
+
+def test_decision_tree_is_kept_in_the_cache_dir(tmp_path, monkeypatch, sample):
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / "cache"
+    words, feedback = sample(0, 40)
+    reports = simulate(words, ["decision_tree_guess"], [0], processes=2, feedback=feedback, cache_dir=cache_dir)
+    assert reports["decision_tree_guess"].games == 40
+    assert len(list(cache_dir.glob("tree-*.bin"))) == 1
+    assert not (tmp_path / ".eldrow-cache").exists()
+
+    # without a cache dir the tree is built in memory, and nothing is written
+    words, feedback = sample(1, 20)
+    simulate(words, ["decision_tree_guess"], [0], feedback=feedback)
+    assert not (tmp_path / ".eldrow-cache").exists()
@@ -0,0 +1,35 @@
+import pytest
+
+from wordle.transposition import TranspositionTable, entry_bytes
+
+
+def test_lru_eviction():
+    table = TranspositionTable(2)
+    table.put("a", 1)
+    table.put("b", 2)
+    assert table.get("a") == 1
+    table.put("c", 3)
+
+    assert table.get("b") is None
+    assert table.get("a") == 1
+    assert table.get("c") == 3
+
+    stats = table.stats
+    assert (stats.hits, stats.misses, stats.stores, stats.evictions, stats.size) == (3, 1, 3, 1, 2)
+    assert stats.hit_rate == 0.75
+
+
+def test_byte_budget_evicts_the_oldest_entries():
+    entry = entry_bytes((frozenset("abc"), "abate"), ("abate",))
+    table = TranspositionTable(max_bytes=2 * entry)
+    for i in range(3):
+        table.put((frozenset("abc"), str(i)), (str(i),))
+    assert table.get((frozenset("abc"), "0")) is None
+    assert table.get((frozenset("abc"), "2")) == ("2",)
+    assert table.stats.bytes <= 2 * entry
+    assert table.stats.evictions == 1
+
+    table.clear()
+    assert table.stats.bytes == 0
+    with pytest.raises(ValueError, match="limit"):
+        TranspositionTable()
@@ -0,0 +1,36 @@
+import pytest
+
+from wordle.strategies import decision_tree_guess, execute_strategy
+from wordle.tree import DecisionTree
+from wordle.wordle import Wordle
+
+
+@pytest.mark.parametrize("criterion", ["minimax", "entropy"])
+def test_tree_solves_every_target(criterion, sample):
+    words, feedback = sample(0, 116)
+    tree = DecisionTree.build(feedback, criterion)
+    for target in words:
+        played = tree.play(target, feedback)
+        assert played[-1] == target
+        assert execute_strategy(Wordle(target), decision_tree_guess(words, tree)) == len(played)
+
+
+def test_hard_mode_tree_only_makes_legal_guesses(sample):
+    words, feedback = sample(0, 116)
+    tree = DecisionTree.build(feedback, hard_mode=True)
+    for target in words:
+        wordle = Wordle(target, True)
+        for guess in tree.play(target, feedback):
+            wordle.make_guess(guess)
+
+
+def test_saved_tree_round_trips(tmp_path, sample):
+    feedback = sample(0, 116).feedback
+    tree = DecisionTree.load(feedback, tmp_path, "entropy")
+    assert DecisionTree.load(feedback, tmp_path, "entropy") is tree
+    assert tree.criterion == "entropy" and not tree.hard_mode
+
+    built = DecisionTree.build(feedback, "entropy")
+    assert tree.words == built.words
+    assert tree.guesses == built.guesses
+    assert tree.children == built.children
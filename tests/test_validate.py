@@ -0,0 +1,46 @@
+import random
+
+from wordle.feedback import FeedbackMatrix
+from wordle.validate import Validator, parse_chain
+from wordle.wordle import Wordle
+
+
+def replay(chain):
+    wordle = Wordle(chain[-1], True)
+    for i, guess in enumerate(chain):
+        if not wordle.is_legal(guess):
+            return i
+        if all(r.value == "G" for r in wordle.make_guess(guess)) and i != len(chain) - 1:
+            return i
+    return None
+
+
+def test_validator_reports_the_first_offending_guess():
+    validator = Validator(FeedbackMatrix.build(["tiger", "track", "tower", "tromp"]))
+    assert validator.check(parse_chain("TRACK,TOWER,TIGER")) is None
+
+    index, reason = validator.check(parse_chain("TRACK,TROMP,TIGER"))
+    assert index == 1
+    assert reason == "char 1 ('r') in 'tromp' is known as wrong"
+    assert validator.check(["track", "tiger", "tiger"])[0] == 1
+    assert "not in the word list" in validator.check(["track", "zzzzz", "tiger"])[1]
+    assert "word length" in validator.check(["track", "tigers"])[1]
+    assert validator.check(parse_chain("TRACK,,TIGER")) == (1, "guess 2 is empty")
+    assert validator.check(parse_chain("TRACK,TIGER,"))[0] == 2
+
+
+def test_validator_matches_replaying_wordle(sample):
+    feedback = sample(0, 200, ("tiger", "track", "tower", "tromp")).feedback
+    validator = Validator(feedback)
+    rng = random.Random(1)
+    for _ in range(500):
+        chain = [rng.choice(feedback.words) for _ in range(rng.randint(1, 4))]
+        failure = validator.check(chain)
+        assert (failure[0] if failure else None) == replay(chain)
+
+
+def test_validate_skips_blank_lines(sample):
+    feedback = sample(0, 200, ("tiger", "track", "tower", "tromp")).feedback
+    verdicts = list(Validator(feedback).validate(["track,tower,tiger\n", "\n", "track,tromp,tiger\n"]))
+    assert [(v.line, v.valid) for v in verdicts] == [(1, True), (3, False)]
+    assert verdicts[1].to_dict()["guess"] == "tromp"
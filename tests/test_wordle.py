@@ -1,4 +1,8 @@
-from wordle.wordle import Wordle, CharResult
+import random
+
+import pytest
+
+from wordle.wordle import Wordle, CharResult, Constraint, ConstraintState
 
 
 def test_correct():
@@ -58,3 +62,54 @@ def test_hard_mode():
     assert not w.is_legal("AGORA")
     assert not w.is_legal("ABACK")
     assert all(r == CharResult.Green for r in w.make_guess("ABATE"))
+
+
+def test_hard_mode_violation():
+    w = Wordle("ABATE", True)
+    w.make_guess("ABBEY")
+
+    with pytest.raises(ValueError, match="does not match known count"):
+        w.make_guess("AGORA")
+    with pytest.raises(ValueError, match="does not meet minimum count"):
+        w.make_guess("ABACK")
+
+
+def test_constraint_state_is_shared_and_hashable():
+    w = Wordle("ABATE", True)
+    c, _ = w.copy_make_guess("ABBEY")
+    assert len(w.constraints) == 0
+    assert c.constraints is not w.constraints
+
+    d, _ = Wordle("ABATE", True).copy_make_guess("ABBEY")
+    assert c.constraints == d.constraints
+    assert len({c.constraints, d.constraints}) == 1
+    assert c.constraints.get("B") == Constraint(
+        min_count=1, min_is_exact=True, known_positions=0b10, known_not_positions=0b100
+    )
+
+
+def test_constraints_built_from_codes():
+    # ABBEY against ABATE is GGXYX, so digits 2, 2, 0, 1, 0
+    code = 2 + 2 * 3 + 1 * 27
+    state = ConstraintState().update_code("ABBEY", code)
+    assert state == Wordle("ABATE", True).copy_make_guess("ABBEY")[0].constraints
+    assert Constraint.from_code([1, 2], code) == state.get("B")
+    assert state.conflict("ABBEY", 0) is not None
+    assert state.conflict("ABBEY", code) is None
+
+
+def test_tracked_candidates_match_is_legal(sample):
+    words, feedback = sample(0, 200)
+    rng = random.Random(1)
+    for target in words[:20]:
+        for matrix in (feedback, None):
+            w = Wordle(target, True, matrix, candidates=words)
+            assert w.candidate_count() == len(words)
+            while not CharResult.all_correct(w.make_guess(guess := rng.choice(w.candidates()))):
+                assert list(w.candidates()) == [word for word in words if w.is_legal(word)]
+                c, _ = w.copy_make_guess(w.candidates()[0])
+                assert list(c.candidates()) == [word for word in words if c.is_legal(word)]
+            assert w.candidates() == (guess,)
+
+    with pytest.raises(ValueError, match="candidates"):
+        Wordle("ABATE").candidates()
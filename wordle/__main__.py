@@ -4,7 +4,7 @@ from pathlib import Path
 import random
 from time import perf_counter_ns
 
-from wordle.lib import load_words
+from wordle.compiled import CompiledWordlist
 from wordle.wordle import Wordle
 from wordle.strategies import *
 
@@ -12,7 +12,9 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger()
 
 word_path = Path("./wordlist.csv")
-words = load_words(word_path)
+compiled = CompiledWordlist.load(word_path, Path(".eldrow-cache"))
+words = compiled.words
+add_letter_index(compiled.letter_index())
 logging.info(f"loaded {len(words)} words from {word_path}")
 
 random_word = random.choice(words)
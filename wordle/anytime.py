@@ -0,0 +1,110 @@
+import random
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from wordle.candidates import CandidateIndex, iter_ids
+
+# target, candidate set, and the guesses so far in play order
+State = Tuple[int, int, Tuple[int, ...]]
+# a state's score, the pattern its last guess got against its target, and the state
+Scored = Tuple[float, int, State]
+
+
+# beam search over every target at once, keeping the states whose candidate sets stay largest (with
+# at most a quarter of the beam on any one target, so it doesn't all go to the same few targets, and
+# each of a target's patterns getting a share before any pattern gets more, so it doesn't all go down
+# the same few lines of play). each round doubles the beam and reshuffles ties, so it keeps finding
+# longer chains until time runs out, and a round that never had to drop a state has searched everything
+class AnytimeSearch:
+    def __init__(self, index: CandidateIndex, seed: Optional[int] = None, width: int = 16):
+        self.index = index
+        self.width = width
+        self.rng = random.Random(seed)
+        self.rounds = 0
+        self.complete = False
+        self.best: List[int] = list()
+
+    # the longest chain found in budget seconds, target first like BitsetSearch.solve. on_best is
+    # called with every longer chain as it is found
+    def run(
+        self,
+        targets: Sequence[str],
+        budget: float,
+        on_best: Optional[Callable[[List[str]], None]] = None,
+    ) -> List[str]:
+        deadline = perf_counter() + budget
+        width = self.width
+        target_ids = [self.index.ids[target] for target in targets]
+        while not self.complete and perf_counter() < deadline:
+            self.complete = self._round(target_ids, width, deadline, on_best)
+            self.rounds += 1
+            width *= 2
+        return self._words(self.best)
+
+    def _words(self, chain: List[int]) -> List[str]:
+        return [self.index.words[i] for i in reversed(chain)]
+
+    def _offer(self, target_id: int, guesses: Tuple[int, ...], on_best: Optional[Callable[[List[str]], None]]) -> None:
+        if len(guesses) + 1 > len(self.best):
+            self.best = [*guesses, target_id]
+            if on_best is not None:
+                on_best(self._words(self.best))
+
+    # returns whether the round kept every state, so nothing was left unsearched
+    def _round(self, target_ids: List[int], width: int, deadline: float, on_best: Optional[Callable[[List[str]], None]]) -> bool:
+        beam: List[State] = [(target_id, self.index.all, ()) for target_id in target_ids]
+        for target_id in target_ids:
+            self._offer(target_id, (), on_best)
+        beam, complete = self._select([(self.rng.random(), -1, state) for state in beam], width)
+
+        while beam:
+            scored: List[Scored] = list()
+            seen: Set[Tuple[int, int]] = set()
+            for target_id, candidates, guesses in beam:
+                if perf_counter() >= deadline:
+                    return False
+                for guess_id in iter_ids(candidates):
+                    if guess_id == target_id:
+                        continue
+                    child = self.index.child(candidates, guess_id, target_id)
+                    chain = (*guesses, guess_id)
+                    self._offer(target_id, chain, on_best)
+                    # only the target is left, so the chain can't go any further
+                    if child.bit_count() <= 1 or (target_id, child) in seen:
+                        continue
+                    seen.add((target_id, child))
+                    pattern = self.index.code(guess_id, target_id)
+                    scored.append((child.bit_count() + self.rng.random(), pattern, (target_id, child, chain)))
+            beam, kept = self._select(scored, width)
+            complete = complete and kept
+        return complete
+
+    def _select(self, scored: List[Scored], width: int) -> Tuple[List[State], bool]:
+        per_target = max(1, width // 4)
+        per_pattern = max(1, per_target // 4)
+        scored.sort(key=lambda s: s[0], reverse=True)
+        selected: List[State] = list()
+        counts: Dict[int, int] = dict()
+        pattern_counts: Dict[Tuple[int, int], int] = dict()
+        # states over their pattern's share only get the places left over
+        deferred: List[State] = list()
+        for _, pattern, state in scored:
+            if len(selected) == width:
+                break
+            count = counts.get(state[0], 0)
+            if count < per_target:
+                pattern_count = pattern_counts.get((state[0], pattern), 0)
+                if pattern_count < per_pattern:
+                    counts[state[0]] = count + 1
+                    pattern_counts[(state[0], pattern)] = pattern_count + 1
+                    selected.append(state)
+                else:
+                    deferred.append(state)
+        for state in deferred:
+            if len(selected) == width:
+                break
+            count = counts[state[0]]
+            if count < per_target:
+                counts[state[0]] = count + 1
+                selected.append(state)
+        return selected, len(selected) == len(scored)
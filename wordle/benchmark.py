@@ -0,0 +1,235 @@
+from argparse import ArgumentParser
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+import json
+import logging
+from pathlib import Path
+import platform
+import random
+from statistics import median
+import sys
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+from wordle.candidates import CandidateIndex
+from wordle.eldrow import worst_solve
+from wordle.feedback import FeedbackMatrix, words_digest
+from wordle.lib import load_words
+from wordle.search import BitsetSearch
+from wordle.strategies import execute_strategy, exhaustive_guess, legal_hard_mode_guess
+from wordle.wordle import Wordle
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+
+
+@dataclass()
+class BenchmarkResult:
+    ops: int
+    repeat: int
+    min_ns: int
+    median_ns: int
+
+    @property
+    def ns_per_op(self) -> float:
+        return self.median_ns / self.ops
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["ns_per_op"] = self.ns_per_op
+        return d
+
+
+# a benchmark is set up once, then its body runs `repeat` times, doing `ops` operations per run
+Benchmark = Callable[[], Tuple[int, Callable[[], None]]]
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int) -> BenchmarkResult:
+    ops, body = benchmark()
+    timings: List[int] = list()
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        body()
+        timings.append(perf_counter_ns() - start)
+    return BenchmarkResult(ops=ops, repeat=repeat, min_ns=min(timings), median_ns=int(median(timings)))
+
+
+def build_benchmarks(words: Sequence[str], seed: int, games: int) -> Dict[str, Benchmark]:
+    rng = random.Random(seed)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(1000)]
+    targets = rng.sample(words, min(games, len(words)))
+
+    def make_guess():
+        wordles = [(Wordle(target), guess) for guess, target in pairs]
+        return len(wordles), lambda: [wordle._make_guess(guess) for wordle, guess in wordles]
+
+    def hard_mode_wordles():
+        wordles = list()
+        for guess, target in pairs[:20]:
+            wordle = Wordle(target, True)
+            wordle.make_guess(guess)
+            wordles.append(wordle)
+        return wordles
+
+    def is_legal():
+        wordles = hard_mode_wordles()
+        return len(wordles) * len(words), lambda: [wordle.is_legal(word) for wordle in wordles for word in words]
+
+    def copy_make_guess():
+        legal = [(wordle, [word for word in words if wordle.is_legal(word)]) for wordle in hard_mode_wordles()]
+        ops = sum(len(guesses) for _, guesses in legal)
+        return ops, lambda: [wordle.copy_make_guess(guess) for wordle, guesses in legal for guess in guesses]
+
+    def strategy(factory):
+        def benchmark():
+            def body():
+                random.seed(seed)
+                for target in targets:
+                    execute_strategy(Wordle(target), factory(words))
+
+            return len(targets), body
+
+        return benchmark
+
+    return {
+        "_make_guess": make_guess,
+        "is_legal": is_legal,
+        "copy_make_guess": copy_make_guess,
+        "exhaustive_guess": strategy(exhaustive_guess),
+        "legal_hard_mode_guess": strategy(legal_hard_mode_guess),
+    }
+
+
+# worst_solve grows too fast to run on every sub-wordlist, so it gets one small one of its own
+def build_solve_benchmarks(words: Sequence[str], seed: int, solve_targets: int) -> Dict[str, Benchmark]:
+    solve_words = sorted(words)
+    solve_for = random.Random(seed).sample(solve_words, min(solve_targets, len(words)))
+
+    def worst_solve_set():
+        possibilities = set(solve_words)
+        return len(solve_for), lambda: [worst_solve(Wordle(target, True), possibilities) for target in solve_for]
+
+    def worst_solve_bitset():
+        feedback = FeedbackMatrix.build(solve_words)
+
+        def body():
+            search = BitsetSearch(CandidateIndex(solve_words, feedback))
+            for target in solve_for:
+                search.solve(target)
+
+        return len(solve_for), body
+
+    return {"worst_solve_set": worst_solve_set, "worst_solve_bitset": worst_solve_bitset}
+
+
+def _sample(words: Sequence[str], limit: int, seed: int) -> List[str]:
+    return sorted(random.Random(seed).sample(list(words), min(limit, len(words))))
+
+
+def run_suite(
+    words: Sequence[str],
+    limits: Sequence[int],
+    seed: int,
+    repeat: int,
+    games: int,
+    solve_targets: int,
+    solve_limit: int,
+) -> Dict[str, Any]:
+    runs = [(limit, build_benchmarks(_sample(words, limit, seed), seed, games)) for limit in limits]
+    runs.append((solve_limit, build_solve_benchmarks(_sample(words, solve_limit, seed), seed, solve_targets)))
+
+    results: Dict[str, Dict[str, Any]] = dict()
+    for limit, benchmarks in runs:
+        for name, benchmark in benchmarks.items():
+            key = f"{name}[{limit}]"
+            result = time_benchmark(benchmark, repeat)
+            results[key] = result.to_dict()
+            logger.info("%s: %.0fns/op (%d ops, median of %d)", key, result.ns_per_op, result.ops, repeat)
+
+    return {
+        "version": _VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "wordlist": words_digest(words),
+            "seed": seed,
+            "limits": list(limits),
+            "solve_limit": solve_limit,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+@dataclass()
+class Comparison:
+    name: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+
+def compare(baseline: Mapping[str, Any], current: Mapping[str, Any], threshold: float) -> Tuple[List[Comparison], List[Comparison]]:
+    comparisons = [
+        Comparison(name, baseline["results"][name]["ns_per_op"], result["ns_per_op"])
+        for name, result in current["results"].items()
+        if name in baseline["results"]
+    ]
+    regressions = [c for c in comparisons if c.ratio > 1 + threshold]
+    return comparisons, regressions
+
+
+# benchmarks the current run has but the baseline doesn't, which compare can't check
+def uncovered(baseline: Mapping[str, Any], current: Mapping[str, Any]) -> List[str]:
+    return [name for name in current["results"] if name not in baseline["results"]]
+
+
+def build_arg_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="benchmark the wordle engine, strategies and eldrow search")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="run the benchmark suite")
+    run.add_argument("wordlist", type=Path, help="wordlist file")
+    run.add_argument("-o", "--output", type=Path, required=True, help="write results to this JSON file")
+    run.add_argument("-l", "--limits", type=int, nargs="+", default=[200, 500, 1000], help="sub-wordlist sizes to benchmark")
+    run.add_argument("-s", "--seed", type=int, default=0, help="random number generator seed")
+    run.add_argument("-r", "--repeat", type=int, default=5, help="runs per benchmark (the median is reported)")
+    run.add_argument("-g", "--games", type=int, default=50, help="games played per strategy benchmark")
+    run.add_argument("-t", "--solve-targets", type=int, default=3, help="targets solved per worst_solve benchmark")
+    run.add_argument("--solve-limit", type=int, default=100, help="sub-wordlist size worst_solve is benchmarked on")
+
+    comparison = subparsers.add_parser("compare", help="compare results against a saved baseline")
+    comparison.add_argument("baseline", type=Path, help="baseline results JSON")
+    comparison.add_argument("current", type=Path, help="current results JSON")
+    comparison.add_argument("--threshold", type=float, default=0.1, help="flag benchmarks slower than the baseline by more than this fraction")
+    return parser
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = build_arg_parser().parse_args()
+
+    if args.command == "run":
+        words = load_words(args.wordlist)
+        suite = run_suite(
+            words, args.limits, args.seed, args.repeat, args.games, args.solve_targets, args.solve_limit
+        )
+        args.output.write_text(json.dumps(suite, indent=2))
+        logger.info("wrote %d results to %s", len(suite["results"]), args.output)
+    else:
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+        comparisons, regressions = compare(baseline, current, args.threshold)
+        for c in comparisons:
+            flag = "REGRESSION" if c in regressions else "improved" if c.ratio < 1 - args.threshold else ""
+            print(f"{c.name:32} {c.baseline_ns:14.0f} {c.current_ns:14.0f} {c.ratio:7.2f}x {flag}")
+        missing = uncovered(baseline, current)
+        for name in missing:
+            print(f"{name:32} {'missing from the baseline':>30}")
+        if regressions or missing:
+            sys.exit(1)
@@ -0,0 +1,113 @@
+import sys
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from wordle.feedback import FeedbackMatrix
+
+_COMPATIBILITY_TARGETS = 4
+# bytes of cached partitions and compatibility graphs an index keeps by default
+MEMORY_BUDGET = 1 << 30
+
+
+def iter_ids(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# candidate sets are integer bitsets over word ids (bit i set means words[i] is still possible);
+# the words consistent with a (guess, pattern) pair are exactly that guess's pattern bucket
+class CandidateIndex:
+    def __init__(self, words: Sequence[str], feedback: FeedbackMatrix, memory_budget: int = MEMORY_BUDGET):
+        self.words = list(words)
+        self.ids: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+        self.all = (1 << len(self.words)) - 1
+        self._feedback = feedback
+        self._feedback_ids = [feedback.index[word] for word in self.words]
+        # the ids to gather each partition's codes from, or None when they are the whole row in order
+        self._gather_ids = self._feedback_ids if self._feedback_ids != list(range(len(feedback))) else None
+        self._partitions: Dict[int, Dict[int, int]] = dict()
+        self._compatibility: Dict[int, List[int]] = dict()
+
+        # a compatibility graph takes about n^2/8 bytes, so large word lists keep fewer of them, and
+        # partitions (whole rows of masks) share what is left, dropping the oldest when full
+        graph_bytes = max(1, len(self.words) ** 2 // 8)
+        self._compatibility_targets = max(1, min(_COMPATIBILITY_TARGETS, memory_budget // 4 // graph_bytes))
+        self._partition_budget = max(0, memory_budget - self._compatibility_targets * graph_bytes)
+        self._partition_bytes: Dict[int, int] = dict()
+        self._partitions_size = 0
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def code(self, guess_id: int, target_id: int) -> int:
+        return self._feedback.code(self._feedback_ids[guess_id], self._feedback_ids[target_id])
+
+    def partition(self, guess_id: int) -> Dict[int, int]:
+        partition = self._partitions.get(guess_id)
+        if partition is None:
+            codes = self._feedback.scores(self._feedback_ids[guess_id], self._gather_ids)
+            bitmaps: Dict[int, bytearray] = dict()
+            size = (len(self.words) + 7) // 8
+            for target_id, code in enumerate(codes):
+                bitmap = bitmaps.get(code)
+                if bitmap is None:
+                    bitmap = bitmaps[code] = bytearray(size)
+                bitmap[target_id >> 3] |= 1 << (target_id & 7)
+            partition = {code: int.from_bytes(bitmap, "little") for code, bitmap in bitmaps.items()}
+
+            size = sum(sys.getsizeof(mask) for mask in partition.values())
+            while self._partitions and self._partitions_size + size > self._partition_budget:
+                oldest = next(iter(self._partitions))
+                del self._partitions[oldest]
+                self._partitions_size -= self._partition_bytes.pop(oldest)
+            self._partitions[guess_id] = partition
+            self._partition_bytes[guess_id] = size
+            self._partitions_size += size
+        return partition
+
+    def consistent(self, guess_id: int, code: int) -> int:
+        return self.partition(guess_id).get(code, 0)
+
+    def child(self, candidates: int, guess_id: int, target_id: int) -> int:
+        return candidates & self.consistent(guess_id, self.code(guess_id, target_id))
+
+    # a is compatible with b when either can follow the other in a hard-mode chain ending in the target
+    def compatibility(self, target_id: int) -> List[int]:
+        compatibility = self._compatibility.get(target_id)
+        if compatibility is None:
+            compatibility = [0] * len(self.words)
+            for guess_id in range(len(self.words)):
+                followers = self.consistent(guess_id, self.code(guess_id, target_id))
+                compatibility[guess_id] |= followers
+                for follower_id in iter_ids(followers):
+                    compatibility[follower_id] |= 1 << guess_id
+            # targets are mostly solved one after another, so only the latest few are worth keeping
+            if len(self._compatibility) >= self._compatibility_targets:
+                del self._compatibility[next(iter(self._compatibility))]
+            self._compatibility[target_id] = compatibility
+        return compatibility
+
+    # every word in a chain is compatible with every other one, so the chain is a clique in the
+    # compatibility graph and can't be longer than the number of colours in a greedy colouring
+    def upper_bound(self, candidates: int, target_id: int) -> int:
+        compatibility = self.compatibility(target_id)
+        colors = 0
+        uncolored = candidates
+        while uncolored:
+            colors += 1
+            available = uncolored
+            while available:
+                low = available & -available
+                uncolored ^= low
+                available &= ~compatibility[low.bit_length() - 1] & ~low
+        return colors
+
+    def to_mask(self, words: Iterable[str]) -> int:
+        mask = 0
+        for word in words:
+            mask |= 1 << self.ids[word]
+        return mask
+
+    def to_words(self, mask: int) -> List[str]:
+        return [self.words[i] for i in iter_ids(mask)]
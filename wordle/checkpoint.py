@@ -0,0 +1,120 @@
+import json
+from logging import getLogger
+import os
+from pathlib import Path
+from time import monotonic
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from wordle.lib import write_json
+from wordle.scheduler import Task
+from wordle.search import Frame
+
+logger = getLogger(__name__)
+
+_VERSION = 1
+
+TaskKey = Tuple[str, Tuple[str, ...]]
+
+
+def task_key(task: Task) -> TaskKey:
+    return task.target, task.prefix
+
+
+def _check_run(path: Path, data: Mapping[str, Any], run_digest: str) -> None:
+    if data["version"] != _VERSION or data["run_digest"] != run_digest:
+        raise ValueError(f"checkpoint '{path}' was written by a different run configuration")
+
+
+# the run's completed tasks live in the checkpoint file itself, while each process saves the search
+# stack of the task it is working on next to it, as <checkpoint>.<pid>.frames
+class Checkpoint:
+    def __init__(self, path: Path, run_digest: str, interval: float):
+        self.path = path
+        self.run_digest = run_digest
+        self.interval = interval
+        self.completed: Dict[TaskKey, List[str]] = dict()
+        self.frames: Dict[TaskKey, List[Frame]] = dict()
+        self._last_save = monotonic()
+
+    @staticmethod
+    def load(path: Path, run_digest: str, interval: float) -> "Checkpoint":
+        checkpoint = Checkpoint(path, run_digest, interval)
+        if path.exists():
+            data = json.loads(path.read_text())
+            _check_run(path, data, run_digest)
+            for target, prefix, chain in data["completed"]:
+                checkpoint.completed[(target, tuple(prefix))] = chain
+
+        for frames_path in path.parent.glob(f"{path.name}.*.frames"):
+            saved = json.loads(frames_path.read_text())
+            _check_run(frames_path, saved, run_digest)
+            key = (saved["target"], tuple(saved["prefix"]))
+            if key not in checkpoint.completed:
+                checkpoint.frames[key] = [Frame.from_dict(frame) for frame in saved["frames"]]
+
+        logger.info(
+            "resuming from %s with %d completed tasks and %d in progress",
+            path,
+            len(checkpoint.completed),
+            len(checkpoint.frames),
+        )
+        return checkpoint
+
+    @property
+    def best_length(self) -> int:
+        return max((len(chain) for chain in self.completed.values()), default=0)
+
+    def complete(self, task: Task, chain: List[str]) -> None:
+        self.completed[task_key(task)] = chain
+        self.frames.pop(task_key(task), None)
+        if monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        write_json(
+            self.path,
+            {
+                "version": _VERSION,
+                "run_digest": self.run_digest,
+                "completed": [[target, prefix, chain] for (target, prefix), chain in self.completed.items()],
+            },
+        )
+        self._last_save = monotonic()
+        logger.info("checkpointed %d completed tasks to %s", len(self.completed), self.path)
+
+    def remove_frames(self) -> None:
+        for frames_path in self.path.parent.glob(f"{self.path.name}.*.frames"):
+            frames_path.unlink()
+
+
+# saves one process's search stack for the task it is running, at most once per interval
+class FrameWriter:
+    def __init__(self, checkpoint_path: Path, run_digest: str, interval: float):
+        self.path = checkpoint_path.with_name(f"{checkpoint_path.name}.{os.getpid()}.frames")
+        self.run_digest = run_digest
+        self.interval = interval
+        self._task: Optional[Task] = None
+        self._last_save = monotonic()
+
+    def start(self, task: Task) -> None:
+        self._task = task
+        self._last_save = monotonic()
+
+    def __call__(self, frames: List[Frame]) -> None:
+        if self._task is None or monotonic() - self._last_save < self.interval:
+            return
+        write_json(
+            self.path,
+            {
+                "version": _VERSION,
+                "run_digest": self.run_digest,
+                "target": self._task.target,
+                "prefix": self._task.prefix,
+                "frames": [frame.to_dict() for frame in frames],
+            },
+        )
+        self._last_save = monotonic()
+
+    def finish(self) -> None:
+        self._task = None
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from functools import cache, cached_property
+from hashlib import sha256
+from logging import getLogger
+import mmap
+from pathlib import Path
+from string import ascii_lowercase
+import struct
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from wordle.index import LetterBitsets, LetterIndex, letter_bitsets
+from wordle.lib import atomic_write, load_words
+
+logger = getLogger(__name__)
+
+_MAGIC = b"EWLC"
+_VERSION = 3
+# magic, version, word length, word count, size and mtime (in ns) of the source file
+_HEADER = struct.Struct("<4sBBIQq")
+
+
+# a wordlist compiled to a memory-mapped file: the casefolded, sorted words a line each, then the letter
+# index's bitsets over word ids, each (n + 7) // 8 bytes: for each position, the words with each letter
+# a-z there, then for each letter a-z, the words with exactly 1, 2, ... up to the word length of it.
+# it is keyed by the source's size and mtime, so it is rebuilt whenever the source changes
+class CompiledWordlist:
+    def __init__(self, words: Sequence[str], source_stat: Tuple[int, int], path: Path, bitsets: memoryview):
+        self.words = list(words)
+        self.source_stat = source_stat
+        self.path = path
+        self._bitsets = bitsets
+        self._letter_index: Optional[LetterIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @cached_property
+    def ids(self) -> Dict[str, int]:
+        return {word: i for i, word in enumerate(self.words)}
+
+    def __reduce__(self):
+        return CompiledWordlist.open, (self.path,)
+
+    # the letter index over the words, read from the compiled bitsets rather than rebuilt
+    def letter_index(self) -> LetterIndex:
+        if self._letter_index is None:
+            self._letter_index = LetterIndex(self.words, bitsets=self._read_bitsets())
+        return self._letter_index
+
+    def _read_bitsets(self) -> LetterBitsets:
+        if not self.words:
+            return dict(), dict()
+        size = (len(self.words) + 7) // 8
+        length = len(self.words[0])
+        masks = (int.from_bytes(self._bitsets[i : i + size], "little") for i in range(0, len(self._bitsets), size))
+        positions = {key: mask for key, mask in zip(_position_keys(length), masks) if mask}
+        exactly = {key: mask for key, mask in zip(_count_keys(length), masks) if mask}
+        return positions, exactly
+
+    # where the compiled form of source is kept, named for its resolved path so that word lists with
+    # the same name in different directories don't share one
+    @staticmethod
+    def path_for(source: Path, cache_dir: Path) -> Path:
+        return cache_dir / f"words-{sha256(str(source.resolve()).encode()).hexdigest()[:16]}.bin"
+
+    @staticmethod
+    def compile(source: Path, path: Path) -> None:
+        # the stat is taken before reading, so a change while compiling still shows up as one
+        stat = source.stat()
+        words = load_words(source)
+        lengths = {len(word) for word in words}
+        if len(lengths) > 1:
+            raise ValueError(f"words must share a single length, found {sorted(lengths)}")
+        word_length = lengths.pop() if lengths else 0
+        for word in words:
+            for char in word:
+                if char not in ascii_lowercase:
+                    raise ValueError(f"'{word}' contains '{char}', which is not a letter from a to z")
+
+        positions, exactly = letter_bitsets(words)
+        masks: Dict[Any, int] = {**positions, **exactly}
+        size = (len(words) + 7) // 8
+        header = _HEADER.pack(_MAGIC, _VERSION, word_length, len(words), stat.st_size, stat.st_mtime_ns)
+        with atomic_write(path) as f:
+            f.write(header)
+            f.write("".join(f"{word}\n" for word in words).encode("ascii"))
+            for key in (*_position_keys(word_length), *_count_keys(word_length)):
+                f.write(masks.get(key, 0).to_bytes(size, "little"))
+
+    @staticmethod
+    @cache
+    def open(path: Path) -> CompiledWordlist:
+        with path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mapped) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a version {_VERSION} compiled wordlist")
+        magic, version, word_length, count, source_size, source_mtime_ns = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"'{path}' is not a version {_VERSION} compiled wordlist")
+
+        table_start = _HEADER.size
+        bitsets_start = table_start + (word_length + 1) * count
+        bitsets_end = bitsets_start + (len(_position_keys(word_length)) + len(_count_keys(word_length))) * ((count + 7) // 8)
+        if len(mapped) < bitsets_end:
+            raise ValueError(f"'{path}' is truncated")
+        words = mapped[table_start:bitsets_start].decode("ascii").split("\n")[:-1]
+        bitsets = memoryview(mapped)[bitsets_start:bitsets_end]
+        return CompiledWordlist(words, (source_size, source_mtime_ns), path, bitsets)
+
+    # the compiled form of source, recompiled whenever the file's size or mtime change
+    @staticmethod
+    def load(source: Path, cache_dir: Path) -> CompiledWordlist:
+        stat = source.stat()
+        path = CompiledWordlist.path_for(source, cache_dir)
+        if path.exists():
+            try:
+                compiled = CompiledWordlist.open(path)
+            except ValueError:
+                logger.info("%s was compiled by an older version, recompiling", source)
+            else:
+                if compiled.source_stat == (stat.st_size, stat.st_mtime_ns):
+                    logger.info("memory-mapped compiled wordlist from %s", path)
+                    return compiled
+                logger.info("%s changed since it was compiled, recompiling", source)
+            CompiledWordlist.open.cache_clear()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        CompiledWordlist.compile(source, path)
+        logger.info("compiled %s to %s", source, path)
+        return CompiledWordlist.open(path)
+
+
+# the keys of the stored bitsets, in the order they are stored: positions, then counts
+@cache
+def _position_keys(word_length: int) -> Tuple[Tuple[int, str], ...]:
+    return tuple((position, char) for position in range(word_length) for char in ascii_lowercase)
+
+
+@cache
+def _count_keys(word_length: int) -> Tuple[Tuple[str, int], ...]:
+    return tuple((char, count) for char in ascii_lowercase for count in range(1, word_length + 1))
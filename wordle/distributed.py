@@ -0,0 +1,346 @@
+from argparse import ArgumentParser
+from functools import partial
+import json
+import logging
+from multiprocessing import Pool
+import os
+from pathlib import Path
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from wordle.candidates import MEMORY_BUDGET, CandidateIndex
+from wordle.feedback import FeedbackMatrix, words_digest
+from wordle.lib import write_json
+from wordle.scheduler import Task, merge, split
+from wordle.search import BitsetSearch, GlobalBest
+from wordle.transposition import TABLE_SIZE, sized_table
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+
+
+# a work queue in a directory every host can see (a shared filesystem, or a local directory for
+# workers on one machine). run.json holds the word list and options, tasks/ one file per task, and
+# results/ one file per finished task. a worker claims a task by creating its file in leases/, which
+# it touches while it works, so a lease whose file hasn't been touched for lease_seconds belongs to a
+# worker that died and can be taken over. hosts' clocks need to agree to well within lease_seconds
+class WorkQueue:
+    def __init__(self, path: Path, lease_seconds: float = 60.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.tasks_dir = path / "tasks"
+        self.leases_dir = path / "leases"
+        self.results_dir = path / "results"
+        # tasks never change once queued and results are only ever replaced by equivalent ones, so
+        # both are read once
+        self._tasks: Optional[List[Tuple[str, Task]]] = None
+        self._results: Dict[str, Dict[str, Any]] = dict()
+        # tasks this queue has seen finished, and the index of the first task not known to be, so
+        # claims don't stat every finished task again
+        self._done: Set[str] = set()
+        self._cursor = 0
+
+    @staticmethod
+    def create(path: Path, words: Sequence[str], tasks: Sequence[Task], branch_and_bound: bool, lease_seconds: float = 60.0) -> "WorkQueue":
+        queue = WorkQueue(path, lease_seconds)
+        if (path / "run.json").exists():
+            raise ValueError(f"'{path}' already holds a work queue")
+        for directory in (queue.tasks_dir, queue.leases_dir, queue.results_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        for i, task in enumerate(tasks):
+            # names sort in the order split put the tasks in, so the biggest are handed out first
+            write_json(queue.tasks_dir / f"{i:06d}.json", {"target": task.target, "prefix": list(task.prefix), "size": task.size})
+        run_digest = words_digest(list(words) + ["--", str(branch_and_bound)])
+        write_json(path / "run.json", {"version": _VERSION, "words": list(words), "branch_and_bound": branch_and_bound, "run_digest": run_digest})
+        logger.info("queued %d tasks in %s", len(tasks), path)
+        return queue
+
+    def config(self) -> Dict[str, Any]:
+        config = json.loads((self.path / "run.json").read_text())
+        if config["version"] != _VERSION:
+            raise ValueError(f"'{self.path}' is not a version {_VERSION} work queue")
+        return config
+
+    def tasks(self) -> List[Tuple[str, Task]]:
+        if self._tasks is None:
+            self._tasks = list()
+            for path in sorted(self.tasks_dir.glob("*.json")):
+                data = json.loads(path.read_text())
+                self._tasks.append((path.stem, Task(data["target"], tuple(data["prefix"]), data["size"])))
+        return self._tasks
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        for path in self.results_dir.glob("*.json"):
+            if path.stem not in self._results:
+                self._results[path.stem] = json.loads(path.read_text())
+                self._done.add(path.stem)
+        return self._results
+
+    def is_done(self, name: str) -> bool:
+        if name in self._done:
+            return True
+        if (self.results_dir / f"{name}.json").exists():
+            self._done.add(name)
+            return True
+        return False
+
+    def _expired(self, lease: Path) -> bool:
+        try:
+            return time.time() - lease.stat().st_mtime > self.lease_seconds
+        except FileNotFoundError:
+            return True
+
+    def _take_lease(self, name: str, worker: str) -> bool:
+        lease = self.leases_dir / f"{name}.json"
+        try:
+            fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self._expired(lease):
+                return False
+            # the expired lease is renamed aside first, so only one of the workers that saw it
+            # expire gets to replace it
+            stale = lease.with_name(f"{name}.{worker}.stale")
+            try:
+                os.rename(lease, stale)
+            except FileNotFoundError:
+                return False
+            holder = stale.read_text()
+            if not self._expired(stale):
+                # its worker renewed it in the meantime, so it goes back
+                try:
+                    os.link(stale, lease)
+                except FileExistsError:
+                    pass
+                stale.unlink()
+                return False
+            stale.unlink()
+            logger.warning("taking over task %s from %s, whose lease expired", name, holder or "an unknown worker")
+            try:
+                fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False
+        with os.fdopen(fd, "w") as f:
+            f.write(worker)
+        return True
+
+    # claims the next task without a result or a live lease, if there is one
+    def claim(self, worker: str) -> Optional[Tuple[str, Task]]:
+        tasks = self.tasks()
+        while self._cursor < len(tasks) and tasks[self._cursor][0] in self._done:
+            self._cursor += 1
+        for i in range(self._cursor, len(tasks)):
+            name, task = tasks[i]
+            if self.is_done(name) or not self._take_lease(name, worker):
+                continue
+            if self.is_done(name):
+                # finished between the check and the lease
+                self.release(name)
+                continue
+            return name, task
+        return None
+
+    def renew(self, name: str) -> None:
+        os.utime(self.leases_dir / f"{name}.json")
+
+    def release(self, name: str) -> None:
+        (self.leases_dir / f"{name}.json").unlink(missing_ok=True)
+
+    def complete(self, name: str, task: Task, chain: List[str], worker: str, elapsed: float) -> None:
+        write_json(
+            self.results_dir / f"{name}.json",
+            {"target": task.target, "prefix": list(task.prefix), "chain": chain, "worker": worker, "elapsed": round(elapsed, 6)},
+        )
+        self._done.add(name)
+        self.release(name)
+
+    def best_length(self) -> int:
+        return max((len(result["chain"]) for result in self.results().values()), default=0)
+
+    def status(self) -> Dict[str, int]:
+        tasks = self.tasks()
+        done = sum(self.is_done(name) for name, _ in tasks)
+        leases = [self.leases_dir / f"{name}.json" for name, _ in tasks if not self.is_done(name)]
+        leased = sum(lease.exists() and not self._expired(lease) for lease in leases)
+        expired = sum(lease.exists() and self._expired(lease) for lease in leases)
+        return {"tasks": len(tasks), "done": done, "leased": leased, "expired": expired, "pending": len(tasks) - done - leased - expired}
+
+    # each finished target's longest chain (target first), combined from all of its tasks' results
+    def merge(self) -> Iterator[Tuple[str, List[str], float]]:
+        tasks = self.tasks()
+        results = self.results()
+        elapsed: Dict[str, float] = dict()
+        finished = list()
+        for name, task in tasks:
+            result = results.get(name)
+            if result is not None:
+                finished.append((task, result["chain"]))
+                elapsed[task.target] = elapsed.get(task.target, 0.0) + result["elapsed"]
+        for target, chain in merge([task for _, task in tasks], finished):
+            yield target, chain, elapsed[target]
+
+
+# keeps a lease alive while its task runs
+class _Heartbeat:
+    def __init__(self, queue: WorkQueue, name: str):
+        self.queue = queue
+        self.name = name
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        missing = False
+        while not self._stop.wait(self.queue.lease_seconds / 3):
+            try:
+                self.queue.renew(self.name)
+                missing = False
+            except FileNotFoundError:
+                # another worker may have moved it aside for a moment to check it, so keep trying
+                if not missing:
+                    logger.warning("lease on task %s is missing, will keep renewing it", self.name)
+                missing = True
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+# runs tasks from the queue until every task has a result, waiting on tasks other workers hold in
+# case their leases expire. returns the number of tasks this worker finished
+def work(
+    path: Path,
+    worker: str,
+    cache_dir: Path,
+    lease_seconds: float = 60.0,
+    table_size: int = TABLE_SIZE,
+    memory_budget: int = MEMORY_BUDGET,
+    poll_interval: float = 1.0,
+) -> int:
+    queue = WorkQueue(path, lease_seconds)
+    config = queue.config()
+    words = config["words"]
+    feedback = FeedbackMatrix.load(words, cache_dir)
+    best = GlobalBest() if config["branch_and_bound"] else None
+    search = BitsetSearch(CandidateIndex(words, feedback, memory_budget), sized_table(table_size), best)
+
+    finished = 0
+    # longest chain this worker has found for each target, to skip its tasks that can't beat it
+    target_best: Dict[str, int] = dict()
+    while True:
+        if best is not None:
+            # chains found by other workers tighten this worker's bound
+            best.offer(queue.best_length())
+        claimed = queue.claim(worker)
+        if claimed is None:
+            status = queue.status()
+            if status["done"] == status["tasks"]:
+                logger.info("worker %s finished %d tasks", worker, finished)
+                return finished
+            time.sleep(poll_interval)
+            continue
+
+        name, task = claimed
+        start = time.perf_counter()
+        if len(task.prefix) + task.size <= target_best.get(task.target, 0):
+            chain = []
+        else:
+            with _Heartbeat(queue, name):
+                chain = search.solve(task.target, task.prefix)
+            target_best[task.target] = max(target_best.get(task.target, 0), len(chain))
+        elapsed = time.perf_counter() - start
+        queue.complete(name, task, chain, worker, elapsed)
+        finished += 1
+        logger.info("worker %s solved task %s %s (%d guesses) in %.2fs", worker, task.target, task.prefix, len(chain), elapsed)
+
+
+def build_arg_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="shard eldrow searches across hosts through a work queue in a shared directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    init = subparsers.add_parser("init", help="split the targets into tasks and queue them")
+    init.add_argument("queue", type=Path, help="queue directory")
+    init.add_argument("wordlist", type=Path, help="wordlist file")
+    init.add_argument("-l", "--limit", type=int, help="limit wordlist to l possibilities (randomly selected)")
+    init.add_argument("-n", "--number", type=int, help="only solve n words")
+    init.add_argument("-s", "--seed", type=int, help="random number generator seed (useful when limiting)")
+    init.add_argument("-d", "--split-depth", type=int, default=0, help="split each target's search into tasks this many guesses deep (one task per target by default)")
+    init.add_argument("-b", "--branch-and-bound", action="store_true", help="prune with upper bounds against the longest chain found by any worker")
+    init.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix")
+
+    worker = subparsers.add_parser("work", help="run queued tasks until every task is done")
+    worker.add_argument("queue", type=Path, help="queue directory")
+    worker.add_argument("-p", "--processes", type=int, default=1, help="run p workers on this host")
+    worker.add_argument("-w", "--worker", default=f"{socket.gethostname()}-{os.getpid()}", help="name recorded on this host's leases and results")
+    worker.add_argument("--lease", type=float, default=60.0, help="seconds without a heartbeat before another worker may take a task over")
+    worker.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix")
+    worker.add_argument("-t", "--table-size", type=int, default=TABLE_SIZE, help="MiB of transposition table per worker (0 disables)")
+    worker.add_argument("-m", "--memory-budget", type=int, default=MEMORY_BUDGET >> 20, help="MiB of cached partitions and compatibility graphs per worker")
+
+    status = subparsers.add_parser("status", help="count finished, leased and pending tasks")
+    status.add_argument("queue", type=Path, help="queue directory")
+
+    merged = subparsers.add_parser("merge", help="combine the results into each target's and the global longest chain")
+    merged.add_argument("queue", type=Path, help="queue directory")
+    merged.add_argument("-o", "--output", type=Path, help="append each finished target's chain to this JSONL file")
+    return parser
+
+
+if __name__ == "__main__":
+    import random
+
+    from wordle.lib import colored_text, load_words
+    from wordle.results import ResultsFile
+    from wordle.wordle import Wordle
+
+    logging.basicConfig(level=logging.INFO)
+    args = build_arg_parser().parse_args()
+
+    if args.command == "init":
+        words = load_words(args.wordlist)
+        if args.seed is not None:
+            random.seed(args.seed)
+        possibilities = random.sample(words, args.limit) if args.limit is not None else words
+        targets = random.sample(possibilities, args.number) if args.number is not None else possibilities
+        possibilities = sorted(possibilities)
+        feedback = FeedbackMatrix.load(possibilities, args.cache_dir)
+        tasks = split(BitsetSearch(CandidateIndex(possibilities, feedback)), targets, args.split_depth)
+        WorkQueue.create(args.queue, possibilities, tasks, args.branch_and_bound)
+    elif args.command == "work":
+        run = partial(
+            work,
+            args.queue,
+            cache_dir=args.cache_dir,
+            lease_seconds=args.lease,
+            table_size=args.table_size,
+            memory_budget=args.memory_budget << 20,
+        )
+        if args.processes == 1:
+            run(args.worker)
+        else:
+            with Pool(args.processes) as pool:
+                pool.map(run, [f"{args.worker}-{i}" for i in range(args.processes)])
+    elif args.command == "status":
+        print(json.dumps(WorkQueue(args.queue).status()))
+    else:
+        queue = WorkQueue(args.queue)
+        output = ResultsFile(args.output, queue.config()["run_digest"]) if args.output is not None else None
+        chains = list()
+        for target, chain, elapsed in queue.merge():
+            chains.append(chain)
+            if output is not None:
+                output.write(target, chain, elapsed)
+        if output is not None:
+            output.close()
+        status = queue.status()
+        logger.info("merged %d finished targets (%d of %d tasks done)", len(chains), status["done"], status["tasks"])
+        worst = max(chains, key=len, default=[])
+        if worst:
+            wordle = Wordle(worst[0], True)
+            logger.info("global longest chain (%d guesses): %s", len(worst), ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(worst)))
@@ -1,17 +1,34 @@
 from argparse import ArgumentParser
+from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import cache
+import itertools
+import json
 import logging
 from multiprocessing import Pool
 from pathlib import Path
 from time import perf_counter_ns
-from typing import Set, List, Mapping, Dict, Optional, Tuple
+from typing import Set, List, Mapping, Dict, Optional, Tuple, FrozenSet
 
-from wordle.wordle import Wordle, CharResult
+from wordle.anytime import AnytimeSearch
+from wordle.candidates import MEMORY_BUDGET, CandidateIndex
+from wordle.checkpoint import Checkpoint, FrameWriter, TaskKey, task_key
+from wordle.feedback import FeedbackMatrix, words_digest
+from wordle.partition import PartitionSearch
+from wordle.results import ResultsFile
+from wordle.scheduler import Task, merge, schedule, split
+from wordle.search import DOMINANCE_SCAN, BitsetSearch, BitsetTable, Frame, GlobalBest
+from wordle.stats import Progress, SearchStats, profiled
+from wordle.transposition import TABLE_SIZE, TranspositionTable, sized_table
+from wordle.wordle import Wordle, build_char_indexes, char_masks
 from wordle.lib import colored_text
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENGINES = ("set", "bitset")
+
+
 def build_arg_parser() -> ArgumentParser:
     parser = ArgumentParser()
     parser.add_argument("wordlist", type=Path, help="wordlist file")
@@ -19,23 +36,69 @@ def build_arg_parser() -> ArgumentParser:
     parser.add_argument("-n", "--number", type=int, help="only solve n words")
     parser.add_argument("-s", "--seed", type=int, help="random number generator seed (useful when limiting)")
     parser.add_argument("-p", "--processes", type=int, help="run across p processes")
+    parser.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix")
+    parser.add_argument("-e", "--engine", choices=ENGINES, default="set", help="candidate set representation used by the search")
+    parser.add_argument("-m", "--memory-budget", type=int, default=MEMORY_BUDGET >> 20, help="MiB of cached partitions and compatibility graphs per process (bitset engine only)")
+    parser.add_argument("-t", "--table-size", type=int, default=TABLE_SIZE, help="MiB of transposition table per process (0 disables)")
+    parser.add_argument("-b", "--branch-and-bound", action="store_true", help="prune with upper bounds against the longest chain found by any target (bitset engine only)")
+    parser.add_argument("-d", "--split-depth", type=int, default=0, help="split each target's search into tasks this many guesses deep, handed out to processes as they free up (bitset engine only)")
+    parser.add_argument("--shared", action="store_true", help="solve every target in one pass over the search tree, sharing subtrees between targets (bitset engine only)")
+    parser.add_argument("--checkpoint", type=Path, help="periodically save progress to this file (bitset engine only)")
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0, help="seconds between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue from the progress saved in --checkpoint")
+    parser.add_argument("--time-budget", type=float, help="before the exact search, spend this many seconds on a beam search that logs each longer chain it finds (and seeds --branch-and-bound with the best)")
+    parser.add_argument("--anytime-only", action="store_true", help="stop after the --time-budget search instead of going on to the exact search")
+    parser.add_argument("-o", "--output", type=Path, help="append each target's result to this JSONL file as it finishes, skipping targets it already holds")
+    parser.add_argument("--progress-interval", type=float, default=30.0, help="seconds between progress reports")
+    parser.add_argument("--stats", type=Path, help="write search statistics for the run to this JSON file")
+    parser.add_argument("--profile", type=Path, help="profile the run with cProfile, saving it to this file (single process only)")
+    parser.add_argument("--trace-memory", action="store_true", help="trace allocations with tracemalloc and report the largest (single process only)")
     return parser
 
-def worst_solve(wordle: Wordle, possibilities: Set[str], filters: Optional[Mapping[str, Set[str]]] = None) -> List[str]:
+SetTable = TranspositionTable[Tuple[FrozenSet[str], str], Tuple[str, ...]]
+
+
+def worst_solve(
+    wordle: Wordle,
+    possibilities: Set[str],
+    filters: Optional[Mapping[str, Set[str]]] = None,
+    table: Optional[SetTable] = None,
+    stats: Optional[SearchStats] = None,
+    depth: int = 0,
+    dominance: bool = True,
+) -> List[str]:
     assert len(possibilities) != 0
     if len(possibilities) == 1:
         word = next(iter(possibilities))
-        assert CharResult.all_correct(wordle.make_guess(word))
+        assert wordle.make_guess_code(word) == wordle.all_correct
+        if stats is not None:
+            stats.leaves += 1
         return [word]
 
+    if table is not None:
+        key = (frozenset(possibilities), wordle.word)
+        cached = table.get(key)
+        if stats is not None:
+            stats.table_lookups += 1
+            stats.table_hits += cached is not None
+        if cached is not None:
+            return list(cached)
+
+    if stats is not None:
+        started = perf_counter_ns()
+        stats.nodes[depth] = stats.nodes.get(depth, 0) + 1
+
     modifieds: List[Tuple[str, Wordle, Set[str]]] = list()
     sub_filters: Dict[str, Set[str]] = dict()
     for possibility in possibilities:
-        modified_wordle, result = wordle.copy_make_guess(possibility)
-        if CharResult.all_correct(result):
+        modified_wordle, code = wordle.copy_make_guess_code(possibility)
+        if code == wordle.all_correct:
             modified_possibilities = {}
         else:
-            if filters is not None:
+            if modified_wordle.tracks_candidates:
+                # the wordle narrowed its own candidates (which are the possibilities) to the survivors
+                modified_possibilities = set(modified_wordle.candidates())
+            elif filters is not None:
                 filter = filters[possibility]
                 modified_possibilities = {word for word in possibilities if word in filter and modified_wordle.is_legal(word)}
             else:
@@ -45,36 +108,204 @@ def worst_solve(wordle: Wordle, possibilities: Set[str], filters: Optional[Mappi
 
     modifieds.sort(key=lambda m: len(m[2]), reverse=True)
     worst_guesses: List[str] = list()
-    for word, m_wordle, m_possibilities in modifieds:
+    # the child sets searched so far, for skipping duplicate and dominated ones the way BitsetSearch does
+    seen: Set[FrozenSet[str]] = set()
+    kept: List[Set[str]] = list()
+    for position, (word, m_wordle, m_possibilities) in enumerate(modifieds):
         if len(m_possibilities) + 1 <= len(worst_guesses):
-            # this can only match the worst solve, since there's not enough words to try
-            continue
+            # this can only match the worst solve, since there's not enough words to try (and the
+            # rest are no larger)
+            if stats is not None:
+                stats.prunes["siblings"] = stats.prunes.get("siblings", 0) + len(modifieds) - position
+            break
+
+        if dominance:
+            child = frozenset(m_possibilities)
+            reason = None
+            if child in seen:
+                reason = "duplicate"
+            elif any(m_possibilities <= other for other in kept[:DOMINANCE_SCAN]):
+                reason = "dominated"
+            if reason is not None:
+                if stats is not None:
+                    stats.prunes[reason] = stats.prunes.get(reason, 0) + 1
+                continue
+            seen.add(child)
+            kept.append(m_possibilities)
 
-        solve = worst_solve(m_wordle, m_possibilities, sub_filters)
+        if stats is not None:
+            bucket = 1 << (len(m_possibilities) - 1).bit_length()
+            stats.child_sizes[bucket] = stats.child_sizes.get(bucket, 0) + 1
+        solve = worst_solve(m_wordle, m_possibilities, sub_filters, table, stats, depth + 1, dominance)
         if len(worst_guesses) < len(solve) + 1:
             solve.append(word)
             worst_guesses = solve
 
+    if table is not None:
+        table.put(key, tuple(worst_guesses))
+    if stats is not None:
+        stats.time_ns[depth] = stats.time_ns.get(depth, 0) + perf_counter_ns() - started
     return worst_guesses
 
 
-def run_worst_solve(words: Set[str], word: str) -> List[str]:
-    wordle = Wordle(word, True)
+# the set engine's table for a word list, shared by every target a process solves over it. every
+# search has its own table, so none is shared between engines or word lists
+@cache
+def _set_table(words: FrozenSet[str], table_size: int) -> Optional[SetTable]:
+    return sized_table(table_size)
+
+
+@dataclass(frozen=True)
+class TaskContext:
+    words: Tuple[str, ...]
+    feedback: FeedbackMatrix
+    table_size: int
+    memory_budget: int = MEMORY_BUDGET
+    checkpoint: Optional[Path] = None
+    run_digest: str = ""
+    checkpoint_interval: float = 60.0
+    # saved search stacks of tasks that were in progress when the checkpoint was written
+    resumed: Mapping[TaskKey, List[Frame]] = field(default_factory=dict, hash=False)
+    engine: str = "bitset"
+
+
+# set in each process (and inherited by pool workers) when searching with branch and bound
+_global_best: Optional[GlobalBest] = None
+# set in each process when running tasks, which only carry their own target and prefix
+_task_context: Optional[TaskContext] = None
+# counters for every bitset search run in this process, taken after each target or task
+_search_stats = SearchStats()
+# longest chain this process has found for each target, so its later (smaller) tasks that can't
+# beat it are skipped, the way the unsplit search skips smaller siblings
+_target_best: Dict[str, int] = dict()
+
+
+# called at the start of every run, in the main process and in each worker
+def _init_worker(global_best: Optional[GlobalBest], task_context: Optional[TaskContext] = None) -> None:
+    global _global_best, _task_context
+    _global_best = global_best
+    _task_context = task_context
+    # the bests belong to the run's word list and prefixes, so none carry over to the next run
+    _target_best.clear()
+
+
+@cache
+def _frame_writer(checkpoint: Path, run_digest: str, interval: float) -> FrameWriter:
+    return FrameWriter(checkpoint, run_digest, interval)
+
+
+def run_task(task: Task) -> Tuple[Task, List[str], SearchStats, float]:
+    context = _task_context
+    assert context is not None
+    # a chain through the task's node can use each of its candidates at most once
+    if len(task.prefix) + task.size <= _target_best.get(task.target, 0):
+        _search_stats.prunes["siblings"] = _search_stats.prunes.get("siblings", 0) + 1
+        return task, [], _search_stats.take(), 0.0
+
+    search = _bitset_search(context.words, context.feedback, context.table_size, _global_best, context.memory_budget)
+    writer = None
+    if context.checkpoint is not None:
+        writer = _frame_writer(context.checkpoint, context.run_digest, context.checkpoint_interval)
+        writer.start(task)
+
+    start = perf_counter_ns()
+    chain = search.solve(task.target, task.prefix, context.resumed.get(task_key(task)), writer)
+    elapsed_ns = perf_counter_ns() - start
+    elapsed = timedelta(microseconds=elapsed_ns / 1000)
+    logger.debug("solved task %s %s (%d candidates, %d guesses) in %s", task.target, task.prefix, task.size, len(chain), elapsed)
+
+    if writer is not None:
+        writer.finish()
+    _target_best[task.target] = max(_target_best.get(task.target, 0), len(chain))
+    return task, chain, _search_stats.take(), elapsed_ns / 1e9
+
+
+@cache
+def _bitset_search(
+    words: Tuple[str, ...],
+    feedback: FeedbackMatrix,
+    table_size: int,
+    best: Optional[GlobalBest],
+    memory_budget: int = MEMORY_BUDGET,
+) -> BitsetSearch:
+    table: Optional[BitsetTable] = sized_table(table_size)
+    return BitsetSearch(CandidateIndex(words, feedback, memory_budget), table, best, _search_stats)
+
+
+def run_worst_solve(
+    words: Set[str],
+    word: str,
+    feedback: Optional[FeedbackMatrix] = None,
+    engine: str = "set",
+    table_size: int = 0,
+    memory_budget: int = MEMORY_BUDGET,
+) -> List[str]:
+    # with a feedback matrix the wordle narrows its candidates by pattern lookups, which beats
+    # filtering possibilities with is_legal
+    wordle = Wordle(word, True, feedback, candidates=sorted(words) if feedback is not None else None)
 
     start = perf_counter_ns()
-    ws = worst_solve(wordle, words)
+    table: Optional[TranspositionTable]
+    if engine == "bitset":
+        if feedback is None:
+            feedback = FeedbackMatrix.build(sorted(words))
+        search = _bitset_search(tuple(sorted(words)), feedback, table_size, _global_best, memory_budget)
+        ws = search.solve(word)
+        table = search.table
+    else:
+        table = _set_table(frozenset(words), table_size)
+        ws = worst_solve(wordle, words, table=table, stats=_search_stats)
     end = perf_counter_ns()
     elapsed = timedelta(microseconds=(end - start) / 1000)
 
     colored_ws = ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(ws))
     logger.info("calculated worst solve for word %s (%d guesses) in %s: %s", word, len(ws), elapsed, colored_ws)
+    if table is not None:
+        logger.info("transposition table: %s", table.stats)
     return ws
 
 
+def solve_target(
+    word: str,
+    words: Set[str],
+    feedback: Optional[FeedbackMatrix],
+    engine: str,
+    table_size: int,
+    memory_budget: int = MEMORY_BUDGET,
+) -> Tuple[str, List[str], SearchStats, float]:
+    start = perf_counter_ns()
+    ws = run_worst_solve(words, word, feedback, engine, table_size, memory_budget)
+    return word, ws, _search_stats.take(), (perf_counter_ns() - start) / 1e9
+
+
+# solves words[target_id] of the context the worker was started with. only the id goes to the worker
+# and only word ids come back, since pickling the possibilities for every target costs more than some
+# of the searches
+def solve_target_id(target_id: int) -> Tuple[int, Tuple[int, ...], SearchStats, float]:
+    context = _task_context
+    assert context is not None
+    words = _possibilities(context.words)
+    _, ws, stats, elapsed = solve_target(
+        context.words[target_id], words, context.feedback, context.engine, context.table_size, context.memory_budget
+    )
+    ids = _word_ids(context.words)
+    return target_id, tuple(ids[w] for w in ws), stats, elapsed
+
+
+@cache
+def _possibilities(words: Tuple[str, ...]) -> Set[str]:
+    return set(words)
+
+
+@cache
+def _word_ids(words: Tuple[str, ...]) -> Dict[str, int]:
+    return {word: i for i, word in enumerate(words)}
+
+
 if __name__ == "__main__":
     import random
 
-    from wordle.lib import load_words
+    from wordle.compiled import CompiledWordlist
 
     parser = build_arg_parser()
     args = parser.parse_args()
@@ -83,9 +314,43 @@ if __name__ == "__main__":
     number: Optional[int] = args.number
     seed: Optional[int] = args.seed
     processes: Optional[int] = args.processes
+    cache_dir: Path = args.cache_dir
+    engine: str = args.engine
+    table_size: int = args.table_size
+    memory_budget: int = args.memory_budget << 20
+    branch_and_bound: bool = args.branch_and_bound
+    if branch_and_bound and engine != "bitset":
+        parser.error("--branch-and-bound requires --engine bitset")
+    split_depth: int = args.split_depth
+    if split_depth and engine != "bitset":
+        parser.error("--split-depth requires --engine bitset")
+    checkpoint_path: Optional[Path] = args.checkpoint
+    checkpoint_interval: float = args.checkpoint_interval
+    resume: bool = args.resume
+    if checkpoint_path is not None and engine != "bitset":
+        parser.error("--checkpoint requires --engine bitset")
+    if resume and checkpoint_path is None:
+        parser.error("--resume requires --checkpoint")
+    shared: bool = args.shared
+    if shared and (engine != "bitset" or branch_and_bound or split_depth or checkpoint_path is not None or processes):
+        parser.error("--shared requires --engine bitset and runs alone in a single process")
+    progress_interval: float = args.progress_interval
+    stats_path: Optional[Path] = args.stats
+    profile_path: Optional[Path] = args.profile
+    trace_memory: bool = args.trace_memory
+    output_path: Optional[Path] = args.output
+    time_budget: Optional[float] = args.time_budget
+    anytime_only: bool = args.anytime_only
+    if time_budget is not None and time_budget <= 0:
+        parser.error("--time-budget must be a positive number of seconds")
+    if anytime_only and (time_budget is None or shared):
+        parser.error("--anytime-only requires --time-budget and can't be used with --shared")
+    if (profile_path is not None or trace_memory) and processes and processes > 1:
+        parser.error("--profile and --trace-memory only see the main process, so require a single process")
 
-    words = load_words(word_path)
+    words = CompiledWordlist.load(word_path, cache_dir).words
     logger.info(f"loaded {len(words)} words from {word_path}")
+    feedback = FeedbackMatrix.load(words, cache_dir, processes)
 
     if seed is not None:
         random.seed(seed)
@@ -104,32 +369,201 @@ if __name__ == "__main__":
         words_to_solve = possibilities
 
     possibilities = set(possibilities)
+    global_best = GlobalBest() if branch_and_bound else None
+    all_targets = list(words_to_solve)
+    output = None
+    done: Dict[str, List[str]] = dict()
+    if output_path is not None:
+        output = ResultsFile(output_path, words_digest(sorted(possibilities) + ["--", str(branch_and_bound)]))
+        done = {word: ws for word, ws in output.load().items() if word in set(all_targets)}
+        words_to_solve = [word for word in words_to_solve if word not in done]
+        if done:
+            logger.info("skipping %d targets already in %s", len(done), output_path)
+        if global_best is not None:
+            global_best.offer(max((len(ws) for ws in done.values()), default=0))
     g_start = perf_counter_ns()
 
-    if not processes or processes == 1:
-        results = list()
-        for word in words_to_solve:
-            result = run_worst_solve(possibilities, word)
-            results.append(result)
-    else:
-        logger.info("running across %d processes", processes)
-        with Pool(processes=processes) as pool:
-            results = pool.starmap(run_worst_solve, [(possibilities, word) for word in words_to_solve])
+    search_stats = SearchStats()
+    results: List[List[str]] = list(done.values())
+    if time_budget is not None:
+        anytime = AnytimeSearch(CandidateIndex(sorted(possibilities), feedback, memory_budget), seed)
+
+        def log_best(ws: List[str]) -> None:
+            wordle = Wordle(ws[0], True, feedback)
+            colored_ws = ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(ws))
+            elapsed = timedelta(microseconds=(perf_counter_ns() - g_start) / 1000)
+            logger.info("anytime search found %d guesses for word %s after %s: %s", len(ws), ws[0], elapsed, colored_ws)
+
+        anytime_best = anytime.run(all_targets, time_budget, log_best)
+        if anytime.complete:
+            logger.info("anytime search covered every chain, so its best is the longest")
+        # the exact search only looks for chains longer than this with branch and bound, so it is kept as a result
+        if anytime_best:
+            results.append(anytime_best)
+        if global_best is not None:
+            global_best.offer(len(anytime_best))
+        if anytime_only or anytime.complete:
+            words_to_solve = []
+
+    def finish(word: str, ws: List[str], elapsed: float) -> None:
+        results.append(ws)
+        if output is not None:
+            output.write(word, ws, elapsed)
+
+    with profiled(profile_path, trace_memory):
+        if shared:
+            shared_search = PartitionSearch(CandidateIndex(sorted(possibilities), feedback, memory_budget), sized_table(table_size))
+            chains = shared_search.solve()
+            shared_elapsed = (perf_counter_ns() - g_start) / 1e9
+            for word in words_to_solve:
+                ws = chains[word]
+                wordle = Wordle(word, True, feedback)
+                colored_ws = ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(ws))
+                logger.info("calculated worst solve for word %s (%d guesses): %s", word, len(ws), colored_ws)
+                # every target is solved in the same pass, so each gets the time of the whole pass
+                finish(word, ws, shared_elapsed)
+            logger.info("expanded %d candidate sets", shared_search.nodes)
+            if shared_search.table is not None:
+                logger.info("transposition table: %s", shared_search.table.stats)
+        elif split_depth or checkpoint_path is not None:
+            checkpoint = None
+            run_digest = ""
+            resumed: Dict[TaskKey, List[Frame]] = dict()
+            if checkpoint_path is not None:
+                run_digest = words_digest(
+                    sorted(possibilities) + ["--"] + all_targets + ["--", str(split_depth), str(branch_and_bound)]
+                )
+                if resume:
+                    checkpoint = Checkpoint.load(checkpoint_path, run_digest, checkpoint_interval)
+                    resumed = checkpoint.frames
+                else:
+                    checkpoint = Checkpoint(checkpoint_path, run_digest, checkpoint_interval)
+                    checkpoint.remove_frames()
+                    checkpoint.save()
+                if global_best is not None:
+                    global_best.offer(checkpoint.best_length)
+
+            task_context = TaskContext(
+                tuple(sorted(possibilities)),
+                feedback,
+                table_size,
+                memory_budget,
+                checkpoint_path,
+                run_digest,
+                checkpoint_interval,
+                resumed,
+            )
+            _init_worker(global_best, task_context)
+            tasks = split(
+                _bitset_search(task_context.words, feedback, table_size, global_best, memory_budget), words_to_solve, split_depth
+            )
+            completed = [(task, checkpoint.completed[task_key(task)]) for task in tasks if checkpoint and task_key(task) in checkpoint.completed]
+            pending = [task for task in tasks if not checkpoint or task_key(task) not in checkpoint.completed]
+            # tasks that were in progress go first, so their saved stacks are picked up straight away
+            pending.sort(key=lambda task: task_key(task) not in resumed)
+
+            progress = Progress(len(pending), "tasks", progress_interval)
+            target_elapsed: Dict[str, float] = dict()
+
+            def record(task_results):
+                for task, chain, task_stats, elapsed in task_results:
+                    if checkpoint is not None:
+                        checkpoint.complete(task, chain)
+                    search_stats.merge(task_stats)
+                    target_elapsed[task.target] = target_elapsed.get(task.target, 0.0) + elapsed
+                    progress.update(detail=search_stats)
+                    yield task, chain
+
+            def log_targets(merged):
+                for word, ws in merged:
+                    wordle = Wordle(word, True, feedback)
+                    colored_ws = ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(ws))
+                    logger.info("calculated worst solve for word %s (%d guesses): %s", word, len(ws), colored_ws)
+                    finish(word, ws, target_elapsed.pop(word, 0.0))
+
+            if not processes or processes == 1:
+                log_targets(merge(tasks, itertools.chain(completed, record(schedule(pending, run_task)))))
+            else:
+                logger.info("running %d tasks across %d processes", len(pending), processes)
+                with Pool(processes=processes, initializer=_init_worker, initargs=(global_best, task_context)) as pool:
+                    log_targets(merge(tasks, itertools.chain(completed, record(schedule(pending, run_task, pool)))))
+
+            if checkpoint is not None:
+                checkpoint.save()
+                checkpoint.remove_frames()
+        elif not processes or processes == 1:
+            _init_worker(global_best)
+            progress = Progress(len(words_to_solve), "targets", progress_interval)
+            for word in words_to_solve:
+                word, ws, target_stats, elapsed = solve_target(word, possibilities, feedback, engine, table_size, memory_budget)
+                finish(word, ws, elapsed)
+                search_stats.merge(target_stats)
+                progress.update(detail=search_stats)
+        else:
+            logger.info("running across %d processes", processes)
+            progress = Progress(len(words_to_solve), "targets", progress_interval)
+            # workers get the word table and feedback matrix once, inherited on fork (the matrix is a
+            # memory-mapped file, so its pages are shared either way), and warm caches to go with them
+            task_context = TaskContext(tuple(sorted(possibilities)), feedback, table_size, memory_budget, engine=engine)
+            for word in task_context.words:
+                build_char_indexes(word)
+                char_masks(word)
+            ids = _word_ids(task_context.words)
+            with Pool(processes=processes, initializer=_init_worker, initargs=(global_best, task_context)) as pool:
+                # targets are recorded in the order they finish, so a long one doesn't hold back the rest
+                for target_id, chain, target_stats, elapsed in pool.imap_unordered(solve_target_id, [ids[w] for w in words_to_solve]):
+                    finish(task_context.words[target_id], [task_context.words[i] for i in chain], elapsed)
+                    search_stats.merge(target_stats)
+                    progress.update(detail=search_stats)
+
+    if output is not None:
+        output.close()
 
     g_end = perf_counter_ns()
     g_elapsed = timedelta(microseconds=(g_end-g_start) / 1000)
 
-    worst_guesses = max(results, key=len)
-    worst_word = worst_guesses[0]
-
-    wordle = Wordle(worst_word, hard_mode=True)
-    colored_worst_guesses = ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(worst_guesses))
-    logger.info(
-        "calculated global (n=%d, l=%d) worst solve for word %s (%d guesses) in %s:\n%s",
-        number,
-        limit,
-        worst_word,
-        len(worst_guesses),
-        g_elapsed,
-        colored_worst_guesses
-    )
+    worst_guesses = max(results, key=len, default=[])
+    if worst_guesses:
+        worst_word = worst_guesses[0]
+        wordle = Wordle(worst_word, hard_mode=True)
+        colored_worst_guesses = ", ".join(colored_text(w, wordle.make_guess(w)) for w in reversed(worst_guesses))
+        logger.info(
+            "calculated global (n=%s, l=%s) worst solve for word %s (%d guesses) in %s:\n%s",
+            number,
+            limit,
+            worst_word,
+            len(worst_guesses),
+            g_elapsed,
+            colored_worst_guesses
+        )
+    else:
+        logger.info("found no chains (n=%s, l=%s) in %s", number, limit, g_elapsed)
+    if not shared:
+        logger.info("search: %s", search_stats)
+
+    if stats_path is not None:
+        run_stats = {
+            "engine": "shared" if shared else engine,
+            "possibilities": len(possibilities),
+            "targets": len(words_to_solve),
+            "processes": processes or 1,
+            "elapsed_s": (g_end - g_start) / 1e9,
+            "longest": list(reversed(worst_guesses)),
+        }
+        if shared:
+            run_stats["search"] = {"total_nodes": shared_search.nodes}
+        else:
+            run_stats["search"] = search_stats.to_dict()
+        # workers' tables stay in the workers, so only a single process run has one to report
+        table: Optional[TranspositionTable] = None
+        if shared:
+            table = shared_search.table
+        elif not processes or processes == 1:
+            if engine == "bitset":
+                table = _bitset_search(tuple(sorted(possibilities)), feedback, table_size, global_best, memory_budget).table
+            else:
+                table = _set_table(frozenset(possibilities), table_size)
+        if table is not None:
+            run_stats["table"] = table.stats.to_dict()
+        stats_path.write_text(json.dumps(run_stats, indent=2))
+        logger.info("wrote run statistics to %s", stats_path)
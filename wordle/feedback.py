@@ -0,0 +1,243 @@
+from __future__ import annotations
+from array import array
+from functools import cache
+from hashlib import sha256
+from logging import getLogger
+import mmap
+from operator import itemgetter
+from multiprocessing import Pool
+from pathlib import Path
+import struct
+import sys
+from time import perf_counter_ns
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from wordle.lib import atomic_write
+# the pattern code helpers live with CharResult, and are imported from here by most callers
+from wordle.wordle import CharResult, all_correct_code, decode, encode, score
+
+logger = getLogger(__name__)
+
+_MAGIC = b"EFBM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBHI")
+
+
+def words_digest(words: Sequence[str]) -> str:
+    return sha256("\n".join(words).encode()).hexdigest()
+
+
+# bytes per pattern code: one up to 5 letter words, two up to 10
+def item_size(length: int) -> int:
+    if all_correct_code(length) <= 0xFF:
+        return 1
+    if all_correct_code(length) <= 0xFFFF:
+        return 2
+    raise ValueError(f"pattern codes for {length} letter words do not fit in 16 bits")
+
+
+_TYPECODES = {1: "B", 2: "H"}
+
+
+# scores guesses against every target a letter at a time rather than a pair at a time: a letter the
+# guess holds once adds 3**i to each target containing it and 3**i more where it sits at i, while
+# a repeated letter's digits depend only on where it is green and how often the target holds it
+def score_rows(words: Sequence[str], start: int, stop: int) -> array:
+    containing: Dict[str, List[int]] = dict()
+    placed: Dict[Tuple[int, str], List[int]] = dict()
+    for target_id, target in enumerate(words):
+        for char in set(target):
+            containing.setdefault(char, list()).append(target_id)
+        for position, char in enumerate(target):
+            placed.setdefault((position, char), list()).append(target_id)
+
+    codes = array(_TYPECODES[item_size(len(words[0]))])
+    for guess in words[start:stop]:
+        row = [0] * len(words)
+        positions: Dict[str, List[int]] = dict()
+        for position, char in enumerate(guess):
+            positions.setdefault(char, list()).append(position)
+
+        for char, at in positions.items():
+            if len(at) == 1:
+                power = 3 ** at[0]
+                for target_id in containing.get(char, ()):
+                    row[target_id] += power
+                for target_id in placed.get((at[0], char), ()):
+                    row[target_id] += power
+                continue
+
+            digits: Dict[Tuple[Tuple[bool, ...], int], int] = dict()
+            for target_id in containing.get(char, ()):
+                target = words[target_id]
+                key = (tuple(target[i] == char for i in at), target.count(char))
+                digit = digits.get(key)
+                if digit is None:
+                    greens, count = key
+                    yellows = count - sum(greens)
+                    digit = 0
+                    for i, green in zip(at, greens):
+                        if green:
+                            digit += 2 * 3**i
+                        elif yellows > 0:
+                            digit += 3**i
+                            yellows -= 1
+                    digits[key] = digit
+                row[target_id] += digit
+        codes.extend(row)
+    return codes
+
+
+# pool workers score whole chunks of rows against the word list they were started with
+_pool_words: Sequence[str] = ()
+
+
+def _init_pool(words: Sequence[str]) -> None:
+    global _pool_words
+    _pool_words = words
+
+
+def _score_chunk(bounds: Tuple[int, int]) -> array:
+    return score_rows(_pool_words, *bounds)
+
+
+class FeedbackMatrix:
+    def __init__(self, words: Sequence[str], codes: Sequence[int], path: Optional[Path] = None):
+        if len(codes) != len(words) ** 2:
+            raise ValueError(f"expected {len(words) ** 2} codes, found {len(codes)}")
+
+        self.words = list(words)
+        self.index: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+        self.path = path
+        self._codes = codes
+        self._count = len(self.words)
+        self._typecode = _TYPECODES[item_size(len(self.words[0]))] if self.words else "B"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __reduce__(self):
+        if self.path is None:
+            return FeedbackMatrix, (self.words, self._codes)
+        return FeedbackMatrix.open, (self.path,)
+
+    def code(self, guess_id: int, target_id: int) -> int:
+        return self._codes[guess_id * self._count + target_id]
+
+    def row(self, guess_id: int) -> Sequence[int]:
+        start = guess_id * self._count
+        return self._codes[start : start + self._count]
+
+    # the codes guess_id gets against each of target_ids (every word if not given), in one call
+    def scores(self, guess_id: int, target_ids: Optional[Sequence[int]] = None) -> Sequence[int]:
+        row = self.row(guess_id)
+        if target_ids is None:
+            return row
+        if len(target_ids) < 2:
+            return tuple(row[i] for i in target_ids)
+        # itemgetter gathers the codes in C, about twice as fast as indexing them one at a time
+        return itemgetter(*target_ids)(row)
+
+    def get(self, guess: str, target: str) -> Optional[int]:
+        guess_id = self.index.get(guess)
+        target_id = self.index.get(target)
+        if guess_id is None or target_id is None:
+            return None
+        return self.code(guess_id, target_id)
+
+    def pattern(self, guess: str, target: str) -> int:
+        return self.code(self.index[guess], self.index[target])
+
+    def results(self, guess: str, target: str) -> Tuple[CharResult, ...]:
+        return decode(self.pattern(guess, target), len(target))
+
+    @staticmethod
+    def build(words: Sequence[str]) -> FeedbackMatrix:
+        words = list(words)
+        _check_words(words)
+
+        start = perf_counter_ns()
+        codes = score_rows(words, 0, len(words)) if words else array("B")
+        elapsed_ms = (perf_counter_ns() - start) / 1_000_000
+        logger.info("built %dx%d feedback matrix in %.0fms", len(words), len(words), elapsed_ms)
+        return FeedbackMatrix(words, codes)
+
+    def save(self, path: Path) -> None:
+        _write(path, self.words, iter([self._codes]))
+
+    # builds the matrix straight to disk a chunk of rows at a time (scored across processes if
+    # given), so only the chunks in flight are ever held in memory
+    @staticmethod
+    def write(words: Sequence[str], path: Path, processes: Optional[int] = None, chunk_rows: int = 256) -> None:
+        words = list(words)
+        _check_words(words)
+
+        start = perf_counter_ns()
+        bounds = [(i, min(i + chunk_rows, len(words))) for i in range(0, len(words), chunk_rows)]
+        if not processes or processes == 1:
+            _write(path, words, (score_rows(words, *b) for b in bounds))
+        else:
+            with Pool(processes=processes, initializer=_init_pool, initargs=(words,)) as pool:
+                _write(path, words, pool.imap(_score_chunk, bounds))
+        elapsed_ms = (perf_counter_ns() - start) / 1_000_000
+        logger.info("wrote %dx%d feedback matrix to %s in %.0fms", len(words), len(words), path, elapsed_ms)
+
+    @staticmethod
+    @cache
+    def open(path: Path) -> FeedbackMatrix:
+        with path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, word_length, size, count = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != _VERSION or size not in _TYPECODES:
+            raise ValueError(f"'{path}' is not a version {_VERSION} feedback matrix")
+
+        table_start = _HEADER.size
+        codes_start = table_start + word_length * count
+        table = mapped[table_start:codes_start].decode("ascii")
+        words = [table[i : i + word_length] for i in range(0, len(table), word_length)]
+        codes: Sequence[int] = memoryview(mapped)[codes_start : codes_start + size * count * count].cast(_TYPECODES[size])
+        if size > 1 and sys.byteorder != "little":
+            codes = array(_TYPECODES[size], codes)
+            codes.byteswap()
+        return FeedbackMatrix(words, codes, path)
+
+    @staticmethod
+    def load(words: Sequence[str], cache_dir: Path, processes: Optional[int] = None) -> FeedbackMatrix:
+        path = cache_dir / f"feedback-{words_digest(words)[:16]}.bin"
+        if path.exists():
+            matrix = FeedbackMatrix.open(path)
+            if matrix.words == list(words):
+                logger.info("memory-mapped feedback matrix from %s", path)
+                return matrix
+            logger.warning("feedback matrix %s does not match word list, rebuilding", path)
+            FeedbackMatrix.open.cache_clear()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        FeedbackMatrix.write(words, path, processes)
+        logger.info("saved feedback matrix to %s", path)
+        return FeedbackMatrix.open(path)
+
+
+def _check_words(words: Sequence[str]) -> None:
+    lengths = {len(word) for word in words}
+    if len(lengths) > 1:
+        raise ValueError(f"words must share a single length, found {sorted(lengths)}")
+    if words:
+        item_size(len(words[0]))
+
+
+def _write(path: Path, words: Sequence[str], chunks: Iterator[Sequence[int]]) -> None:
+    word_length = len(words[0]) if words else 0
+    size = item_size(word_length) if words else 1
+    header = _HEADER.pack(_MAGIC, _VERSION, word_length, size, len(words))
+
+    with atomic_write(path) as f:
+        f.write(header)
+        f.write("".join(words).encode("ascii"))
+        for chunk in chunks:
+            if not isinstance(chunk, array) or chunk.typecode != _TYPECODES[size]:
+                chunk = array(_TYPECODES[size], chunk)
+            if size > 1 and sys.byteorder != "little":
+                chunk.byteswap()
+            f.write(chunk.tobytes())
@@ -0,0 +1,81 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from wordle.candidates import iter_ids
+from wordle.transposition import TranspositionTable
+from wordle.wordle import ConstraintState
+
+
+# bitsets over word ids of the words with each letter at each position, and of the words with
+# exactly k of each letter (k from 1 up to the word length)
+LetterBitsets = Tuple[Dict[Tuple[int, str], int], Dict[Tuple[str, int], int]]
+
+
+def letter_bitsets(words: Sequence[str]) -> LetterBitsets:
+    positions: Dict[Tuple[int, str], int] = dict()
+    exactly: Dict[Tuple[str, int], int] = dict()
+    for word_id, word in enumerate(words):
+        bit = 1 << word_id
+        for position, char in enumerate(word):
+            positions[(position, char)] = positions.get((position, char), 0) | bit
+        for char, count in Counter(word).items():
+            exactly[(char, count)] = exactly.get((char, count), 0) | bit
+    return positions, exactly
+
+
+# inverted index from letters to bitsets of word ids, turning a constraint state into its
+# candidate set with a handful of intersections instead of a scan of the word list. the bitsets
+# can be handed over precomputed, as a compiled wordlist stores them
+class LetterIndex:
+    def __init__(self, words: Sequence[str], cache_size: int = 4096, bitsets: Optional[LetterBitsets] = None):
+        self.words = list(words)
+        self.ids: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+        self.all = (1 << len(self.words)) - 1
+        self.positions, self.exactly = bitsets if bitsets is not None else letter_bitsets(self.words)
+
+        # words with at least k of a letter are those with exactly k, k + 1, ...
+        self.at_least: Dict[Tuple[str, int], int] = dict()
+        length = len(self.words[0]) if self.words else 0
+        for char in {char for char, _ in self.exactly}:
+            mask = 0
+            for count in range(length, 0, -1):
+                mask |= self.exactly.get((char, count), 0)
+                self.at_least[(char, count)] = mask
+
+        self._candidates: TranspositionTable[ConstraintState, int] = TranspositionTable(cache_size)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.ids
+
+    def candidates(self, state: ConstraintState) -> int:
+        mask = self._candidates.get(state)
+        if mask is None:
+            mask = self.all
+            for char, constraint in state.items():
+                if constraint.min_is_exact and constraint.min_count:
+                    mask &= self.exactly.get((char, constraint.min_count), 0)
+                elif constraint.min_is_exact:
+                    mask &= ~self.at_least.get((char, 1), 0)
+                elif constraint.min_count:
+                    mask &= self.at_least.get((char, constraint.min_count), 0)
+                for position in iter_ids(constraint.known_positions):
+                    mask &= self.positions.get((position, char), 0)
+                for position in iter_ids(constraint.known_not_positions):
+                    mask &= ~self.positions.get((position, char), 0)
+            self._candidates.put(state, mask)
+        return mask
+
+    def is_legal(self, state: ConstraintState, word: str) -> bool:
+        return bool(self.candidates(state) >> self.ids[word] & 1)
+
+    def to_mask(self, words: Iterable[str]) -> int:
+        mask = 0
+        for word in words:
+            mask |= 1 << self.ids[word]
+        return mask
+
+    def to_words(self, mask: int) -> List[str]:
+        return [self.words[i] for i in iter_ids(mask)]
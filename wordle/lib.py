@@ -1,5 +1,9 @@
+from contextlib import contextmanager
+import json
+import os
 from pathlib import Path
-from typing import Sequence
+import socket
+from typing import Any, BinaryIO, Iterator, Sequence
 
 from termcolor import colored
 
@@ -15,6 +19,24 @@ def load_words(path: Path) -> Sequence[str]:
     return words
 
 
+# a file to write path's new contents to, which only replaces path once it's complete, so readers
+# (in other processes, or on other hosts sharing the directory) never see a partial write
+@contextmanager
+def atomic_write(path: Path) -> Iterator[BinaryIO]:
+    partial = path.with_name(f"{path.name}.{socket.gethostname()}.{os.getpid()}.partial")
+    try:
+        with partial.open("wb") as f:
+            yield f
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def write_json(path: Path, data: Any) -> None:
+    with atomic_write(path) as f:
+        f.write(json.dumps(data).encode())
+
+
 def colored_text(word: str, results: Sequence[CharResult]) -> str:
     s = ""
     for char, result in zip(word, results, strict=True):
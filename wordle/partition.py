@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional, Tuple
+
+from wordle.candidates import CandidateIndex, iter_ids
+from wordle.feedback import all_correct_code
+from wordle.transposition import TranspositionTable
+
+Chains = Dict[int, Tuple[int, ...]]
+PartitionTable = TranspositionTable[int, Chains]
+
+
+# solves every target at once: after guessing g from a candidate set, each target lands in the
+# bucket of candidates sharing its pattern, and that bucket is the next candidate set for all of
+# them, so each (candidate set, guess) pair is expanded once instead of once per target
+class PartitionSearch:
+    def __init__(self, index: CandidateIndex, table: Optional[PartitionTable] = None):
+        self.index = index
+        self.table = table
+        self.nodes = 0
+        word_length = len(index.words[0]) if index.words else 0
+        self._all_correct = all_correct_code(word_length)
+
+    # the longest chain (target first, like the other engines) ending in each target
+    def solve(self) -> Dict[str, List[str]]:
+        chains = self._solve(self.index.all)
+        return {
+            self.index.words[target_id]: [self.index.words[i] for i in chain]
+            for target_id, chain in chains.items()
+        }
+
+    def longest(self) -> List[str]:
+        return max(self.solve().values(), key=len)
+
+    def _solve(self, candidates: int) -> Chains:
+        if self.table is not None:
+            cached = self.table.get(candidates)
+            if cached is not None:
+                return cached
+
+        self.nodes += 1
+        chains: Chains = {target_id: (target_id,) for target_id in iter_ids(candidates)}
+        if len(chains) > 1:
+            for guess_id in chains:
+                for code, consistent in self.index.partition(guess_id).items():
+                    bucket = candidates & consistent
+                    if not bucket or code == self._all_correct:
+                        continue
+
+                    size = bucket.bit_count()
+                    if size == 1:
+                        target_id = bucket.bit_length() - 1
+                        if len(chains[target_id]) < 2:
+                            chains[target_id] = (target_id, guess_id)
+                        continue
+
+                    # no chain below the bucket can be longer than the bucket itself
+                    if all(len(chains[target_id]) >= size + 1 for target_id in iter_ids(bucket)):
+                        continue
+
+                    for target_id, chain in self._solve(bucket).items():
+                        if len(chain) + 1 > len(chains[target_id]):
+                            chains[target_id] = chain + (guess_id,)
+
+        if self.table is not None:
+            self.table.put(candidates, chains)
+        return chains
@@ -0,0 +1,60 @@
+import json
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, IO, List, Optional
+
+logger = getLogger(__name__)
+
+
+# one JSON line per solved target, flushed as each target finishes so the file can be tailed and a
+# killed run keeps everything it finished. lines from runs with another run digest are ignored
+class ResultsFile:
+    def __init__(self, path: Path, run_digest: str):
+        self.path = path
+        self.run_digest = run_digest
+        self._file: Optional[IO[str]] = None
+
+    # chains (target first) of the targets already solved by this run
+    def load(self) -> Dict[str, List[str]]:
+        done: Dict[str, List[str]] = dict()
+        if not self.path.exists():
+            return done
+
+        data = self.path.read_text()
+        lines = data.splitlines()
+        if data and not data.endswith("\n"):
+            # the run was killed partway through a line
+            logger.warning("dropping incomplete last line of %s", self.path)
+            lines.pop()
+            self.path.write_text("".join(f"{line}\n" for line in lines))
+
+        skipped = 0
+        for line in lines:
+            record = json.loads(line)
+            if record["run"] != self.run_digest:
+                skipped += 1
+                continue
+            done[record["target"]] = list(reversed(record["chain"]))
+        if skipped:
+            logger.warning("ignoring %d results in %s from a different run configuration", skipped, self.path)
+        logger.info("found %d solved targets in %s", len(done), self.path)
+        return done
+
+    def write(self, target: str, chain: List[str], elapsed: float) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a")
+        record = {
+            "run": self.run_digest,
+            "target": target,
+            "chain": list(reversed(chain)),
+            "length": len(chain),
+            "elapsed": round(elapsed, 6),
+        }
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from logging import getLogger
+from multiprocessing.pool import Pool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from wordle.search import BitsetSearch
+
+logger = getLogger(__name__)
+
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class Task:
+    target: str
+    prefix: Tuple[str, ...]
+    # candidates left at the task's node, a proxy for how long the task will take
+    size: int
+
+
+# splits each target's search tree into one task per node `depth` guesses down. targets with the
+# most work go first, and each target's tasks stay together (largest first) so workers share its
+# per-target tables
+def split(search: BitsetSearch, targets: Iterable[str], depth: int) -> List[Task]:
+    groups: List[List[Task]] = list()
+    for target in targets:
+        frontier = [Task(target, (), len(search.index))]
+        for _ in range(depth):
+            expanded: List[Task] = list()
+            for task in frontier:
+                children = search.expand(task.target, task.prefix)
+                if not children:
+                    expanded.append(task)
+                for guess, size in children:
+                    expanded.append(Task(task.target, task.prefix + (guess,), size))
+            frontier = expanded
+        frontier.sort(key=lambda t: t.size, reverse=True)
+        groups.append(frontier)
+
+    groups.sort(key=lambda group: sum(t.size for t in group), reverse=True)
+    tasks = [task for group in groups for task in group]
+    logger.info("split %d targets into %d tasks at depth %d", len(set(t.target for t in tasks)), len(tasks), depth)
+    return tasks
+
+
+# runs tasks from a shared queue, so idle workers pick up the next task as soon as they finish one
+def schedule(tasks: List[Task], run: Callable[[Task], R], pool: Optional[Pool] = None) -> Iterator[R]:
+    if pool is None:
+        return map(run, tasks)
+    return pool.imap_unordered(run, tasks, chunksize=1)
+
+
+# yields each target's longest chain once all of its tasks are done
+def merge(tasks: List[Task], results: Iterable[Tuple[Task, List[str]]]) -> Iterator[Tuple[str, List[str]]]:
+    remaining: Dict[str, int] = dict()
+    for task in tasks:
+        remaining[task.target] = remaining.get(task.target, 0) + 1
+
+    best: Dict[str, List[str]] = dict()
+    for task, chain in results:
+        if len(chain) > len(best.get(task.target, ())):
+            best[task.target] = chain
+        remaining[task.target] -= 1
+        if not remaining[task.target]:
+            yield task.target, best.pop(task.target, [])
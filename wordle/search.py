@@ -0,0 +1,293 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import multiprocessing
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from wordle.candidates import CandidateIndex, iter_ids
+from wordle.stats import SearchStats
+from wordle.transposition import TranspositionTable
+
+BitsetTable = TranspositionTable[Tuple[int, int], Tuple[Tuple[int, ...], int]]
+# each child set is checked against at most this many of the largest kept siblings for dominance, since
+# checking all of them is quadratic in a node's guesses. small nodes keep fewer than this, so they still
+# check every sibling; at the root of the full list it keeps nearly all of the pruning at a fifth of the cost
+DOMINANCE_SCAN = 32
+
+
+# longest chain length found so far, shared by every target and every process it was created before
+class GlobalBest:
+    def __init__(self, length: int = 0):
+        self._value = multiprocessing.Value("i", length)
+
+    @property
+    def length(self) -> int:
+        return self._value.value
+
+    def offer(self, length: int) -> bool:
+        if length <= self._value.value:
+            return False
+        with self._value.get_lock():
+            if length <= self._value.value:
+                return False
+            self._value.value = length
+            return True
+
+
+# one node of the explicit search stack: its children (guess and child set size, largest first)
+# are searched in order, with position pointing at the next one
+@dataclass()
+class Frame:
+    candidates: int
+    depth: int
+    children: List[Tuple[int, int]]
+    position: int = 0
+    worst_guesses: List[int] = field(default_factory=list)
+    upper: int = 1
+    # when the node was entered (or resumed), for the time per depth stats
+    started: int = field(default_factory=perf_counter_ns, compare=False, repr=False)
+
+    # takes the result of the child just searched
+    def receive(self, chain: List[int], upper: int) -> None:
+        guess_id = self.children[self.position - 1][0]
+        self.upper = max(self.upper, upper + 1)
+        if chain and len(self.worst_guesses) < len(chain) + 1:
+            chain.append(guess_id)
+            self.worst_guesses = chain
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "candidates": self.candidates,
+            "depth": self.depth,
+            "children": list(self.children),
+            "position": self.position,
+            "worst_guesses": list(self.worst_guesses),
+            "upper": self.upper,
+        }
+
+    @staticmethod
+    def from_dict(d: Mapping[str, Any]) -> Frame:
+        return Frame(
+            candidates=d["candidates"],
+            depth=d["depth"],
+            children=[(guess_id, size) for guess_id, size in d["children"]],
+            position=d["position"],
+            worst_guesses=list(d["worst_guesses"]),
+            upper=d["upper"],
+        )
+
+
+class BitsetSearch:
+    checkpoint_interval = 4096
+
+    def __init__(
+        self,
+        index: CandidateIndex,
+        table: Optional[BitsetTable] = None,
+        best: Optional[GlobalBest] = None,
+        stats: Optional[SearchStats] = None,
+        dominance: bool = True,
+    ):
+        self.index = index
+        self.table = table
+        # with a global best, subtrees that can't beat it are pruned, so only the overall
+        # longest chain is exact and other targets may return shorter (or empty) chains
+        self.best = best
+        self.stats = stats if stats is not None else SearchStats()
+        self.dominance = dominance
+
+    # solves the node reached by guessing prefix, returning the full chain (prefix included). frames
+    # resumes a search from a stack saved by on_checkpoint, which is called every checkpoint_interval steps
+    def solve(
+        self,
+        target: str,
+        prefix: Sequence[str] = (),
+        frames: Optional[List[Frame]] = None,
+        on_checkpoint: Optional[Callable[[List[Frame]], None]] = None,
+    ) -> List[str]:
+        target_id = self.index.ids[target]
+        if frames:
+            chain, _ = self._run(target_id, frames, on_checkpoint)
+        else:
+            candidates = self.candidates(target_id, prefix)
+            if self._prunable(target_id, candidates, len(prefix)):
+                self._prune("root")
+                return []
+            chain, _ = self._solve(target_id, candidates, len(prefix), on_checkpoint)
+
+        if not chain:
+            return []
+        return [self.index.words[i] for i in chain] + list(reversed(prefix))
+
+    def candidates(self, target_id: int, prefix: Sequence[str] = ()) -> int:
+        candidates = self.index.all
+        for guess in prefix:
+            candidates = self.index.child(candidates, self.index.ids[guess], target_id)
+        return candidates
+
+    # legal next guesses after prefix (other than the target), with the size of each child's candidate
+    # set, largest first and without the duplicate or dominated ones the search itself would skip
+    def expand(self, target: str, prefix: Sequence[str] = ()) -> List[Tuple[str, int]]:
+        target_id = self.index.ids[target]
+        children = self._children(target_id, self.candidates(target_id, prefix))
+        return [(self.index.words[guess_id], size) for guess_id, size in children]
+
+    # returns the longest chain found below the node and an upper bound on the longest chain
+    # possible there, which only differ when the global best pruned part of the subtree
+    def _solve(
+        self,
+        target_id: int,
+        candidates: int,
+        depth: int,
+        on_checkpoint: Optional[Callable[[List[Frame]], None]] = None,
+    ) -> Tuple[List[int], int]:
+        entered = self._enter(target_id, candidates, depth)
+        if isinstance(entered, Frame):
+            return self._run(target_id, [entered], on_checkpoint)
+        return entered
+
+    # either the node's result, when it is a leaf or already in the table, or a frame to search it from
+    def _enter(self, target_id: int, candidates: int, depth: int) -> Union[Frame, Tuple[List[int], int]]:
+        assert candidates >> target_id & 1
+        if candidates.bit_count() == 1:
+            self.stats.leaves += 1
+            self._offer(depth + 1)
+            return [target_id], 1
+
+        if self.table is not None:
+            self.stats.table_lookups += 1
+            cached = self.table.get((candidates, target_id))
+            if cached is not None:
+                chain, upper = cached
+                if len(chain) == upper or depth + upper <= self._best_length():
+                    self.stats.table_hits += 1
+                    self._offer(depth + len(chain))
+                    return list(chain), upper
+
+        nodes = self.stats.nodes
+        nodes[depth] = nodes.get(depth, 0) + 1
+        return Frame(candidates, depth, self._children(target_id, candidates))
+
+    # the node's guesses to search and their child set sizes, largest first
+    def _children(self, target_id: int, candidates: int) -> List[Tuple[int, int]]:
+        if not self.dominance:
+            children: List[Tuple[int, int]] = list()
+            for guess_id in iter_ids(candidates):
+                if guess_id == target_id:
+                    continue
+                children.append((guess_id, self.index.child(candidates, guess_id, target_id).bit_count()))
+            children.sort(key=lambda c: c[1], reverse=True)
+            return children
+
+        child_sets: List[Tuple[int, int, int]] = list()
+        for guess_id in iter_ids(candidates):
+            if guess_id == target_id:
+                continue
+            child = self.index.child(candidates, guess_id, target_id)
+            child_sets.append((guess_id, child.bit_count(), child))
+        child_sets.sort(key=lambda c: c[1], reverse=True)
+        return self._undominated(child_sets)
+
+    # every chain through a child set can be played through any superset of it (each later candidate
+    # set is a subset too), so siblings with a duplicate or dominated child set can't give longer chains
+    def _undominated(self, child_sets: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+        children: List[Tuple[int, int]] = list()
+        kept: List[int] = list()
+        seen = set()
+        duplicates = dominated = 0
+        for guess_id, size, child in child_sets:
+            if child in seen:
+                duplicates += 1
+                continue
+            # kept sets are at least as large, and only identical sets are subsets of an equal sized one.
+            # the largest are the likeliest supersets, so those are the ones checked
+            if any(child | other == other for other in kept[:DOMINANCE_SCAN]):
+                dominated += 1
+                continue
+            seen.add(child)
+            kept.append(child)
+            children.append((guess_id, size))
+
+        if duplicates:
+            self._prune("duplicate", duplicates)
+        if dominated:
+            self._prune("dominated", dominated)
+        return children
+
+    def _run(
+        self, target_id: int, stack: List[Frame], on_checkpoint: Optional[Callable[[List[Frame]], None]]
+    ) -> Tuple[List[int], int]:
+        result: Optional[Tuple[List[int], int]] = None
+        steps = 0
+        child_sizes, time_ns = self.stats.child_sizes, self.stats.time_ns
+        while True:
+            frame = stack[-1]
+            if result is not None:
+                frame.receive(*result)
+                result = None
+
+            steps += 1
+            if on_checkpoint is not None and steps % self.checkpoint_interval == 0:
+                on_checkpoint(stack)
+
+            pushed = False
+            while frame.position < len(frame.children):
+                guess_id, size = frame.children[frame.position]
+                if size + 1 <= len(frame.worst_guesses):
+                    # sorted by size, so no remaining sibling has enough words to beat the worst solve
+                    self._prune("siblings", len(frame.children) - frame.position)
+                    frame.position = len(frame.children)
+                    break
+
+                child = self.index.child(frame.candidates, guess_id, target_id)
+                if self.best is not None:
+                    best = self.best.length
+                    if frame.depth + 1 + size <= best:
+                        self._prune("global_size", len(frame.children) - frame.position)
+                        frame.upper = max(frame.upper, size + 1)
+                        frame.position = len(frame.children)
+                        break
+                    child_upper = self.index.upper_bound(child, target_id)
+                    if frame.depth + 1 + child_upper <= best:
+                        self._prune("global_bound")
+                        frame.upper = max(frame.upper, child_upper + 1)
+                        frame.position += 1
+                        continue
+
+                bucket = 1 << (size - 1).bit_length()
+                child_sizes[bucket] = child_sizes.get(bucket, 0) + 1
+                frame.position += 1
+                entered = self._enter(target_id, child, frame.depth + 1)
+                if isinstance(entered, Frame):
+                    stack.append(entered)
+                    pushed = True
+                    break
+                frame.receive(*entered)
+
+            if pushed:
+                continue
+
+            stack.pop()
+            time_ns[frame.depth] = time_ns.get(frame.depth, 0) + perf_counter_ns() - frame.started
+            worst_guesses, upper = frame.worst_guesses, max(frame.upper, len(frame.worst_guesses))
+            if self.table is not None:
+                self.table.put((frame.candidates, target_id), (tuple(worst_guesses), upper))
+            if not stack:
+                return worst_guesses, upper
+            result = (worst_guesses, upper)
+
+    def _prunable(self, target_id: int, candidates: int, depth: int) -> bool:
+        if self.best is None:
+            return False
+        best = self.best.length
+        return depth + candidates.bit_count() <= best or depth + self.index.upper_bound(candidates, target_id) <= best
+
+    def _prune(self, reason: str, count: int = 1) -> None:
+        self.stats.prunes[reason] = self.stats.prunes.get(reason, 0) + count
+
+    def _best_length(self) -> int:
+        return self.best.length if self.best is not None else 0
+
+    def _offer(self, length: int) -> None:
+        if self.best is not None:
+            self.best.offer(length)
@@ -0,0 +1,225 @@
+from argparse import ArgumentParser
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+from pathlib import Path
+import sys
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from wordle.candidates import MEMORY_BUDGET, CandidateIndex
+from wordle.feedback import FeedbackMatrix, decode, encode, score
+from wordle.index import LetterIndex
+from wordle.search import BitsetSearch
+from wordle.transposition import TABLE_SIZE, sized_table
+from wordle.wordle import CharResult, ConstraintState
+
+logger = logging.getLogger(__name__)
+
+# each request is one JSON object per line, with an "op" and an optional "id" echoed back in its
+# response. responses are written as requests finish, so they can arrive out of order:
+#   {"op": "score", "guess": "track", "target": "tiger"}
+#   {"op": "legal", "target": "tiger", "guesses": ["track"]}
+#   {"op": "legal", "history": [["track", "GYXXX"]]}
+#   {"op": "worst_solve", "target": "tiger", "guesses": ["track"]}
+Write = Callable[[str], Awaitable[None]]
+
+# the search each worker process keeps for the life of the service, so its tables stay warm
+_search: Optional[BitsetSearch] = None
+
+
+def _init_worker(words: Sequence[str], feedback: FeedbackMatrix, table_size: int, memory_budget: int) -> None:
+    global _search
+    _search = BitsetSearch(CandidateIndex(words, feedback, memory_budget), sized_table(table_size))
+
+
+def _worst_solve(target: str, guesses: Tuple[str, ...]) -> Tuple[List[str], float]:
+    assert _search is not None
+    start = perf_counter_ns()
+    chain = _search.solve(target, guesses)
+    return list(reversed(chain)), (perf_counter_ns() - start) / 1e9
+
+
+class Service:
+    def __init__(
+        self,
+        words: Sequence[str],
+        feedback: FeedbackMatrix,
+        processes: Optional[int] = None,
+        max_candidates: int = 500,
+        table_size: int = TABLE_SIZE,
+        memory_budget: int = MEMORY_BUDGET,
+        letters: Optional[LetterIndex] = None,
+    ):
+        self.words = list(words)
+        self.feedback = feedback
+        # searches with more candidates than this are refused rather than tying up a worker for hours
+        self.max_candidates = max_candidates
+        self.letters = letters if letters is not None else LetterIndex(self.words)
+        self.candidates = CandidateIndex(self.words, feedback, memory_budget)
+        self.pool = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_worker,
+            initargs=(self.words, feedback, table_size, memory_budget),
+        )
+        self._ops: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+            "score": self.score,
+            "legal": self.legal,
+            "worst_solve": self.worst_solve,
+        }
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+    def _code(self, guess: str, target: str) -> int:
+        code = self.feedback.get(guess, target)
+        return code if code is not None else score(guess, target)
+
+    async def score(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        guess, target = request["guess"].casefold(), request["target"].casefold()
+        if len(guess) != len(target):
+            raise ValueError(f"guess ({guess}) does not match word length ({len(target)})")
+        code = self._code(guess, target)
+        return {"result": CharResult.to_string(iter(decode(code, len(target)))), "code": code}
+
+    # the constraints left by a history given either as guesses against a target or as
+    # (guess, result) pairs, with results written like "GYXXX"
+    def _constraints(self, request: Dict[str, Any]) -> ConstraintState:
+        state = ConstraintState()
+        if "target" in request:
+            target = request["target"].casefold()
+            for guess in request.get("guesses", []):
+                guess = guess.casefold()
+                state = state.update_code(guess, self._code(guess, target))
+        else:
+            for guess, result in request.get("history", []):
+                if len(guess) != len(result):
+                    raise ValueError(f"result '{result}' does not match guess '{guess}'")
+                guess, code = guess.casefold(), encode([CharResult(char) for char in result.upper()])
+                message = state.conflict(guess, code)
+                if message is not None:
+                    raise ValueError(message)
+                state = state.update_code(guess, code)
+        return state
+
+    async def legal(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        words = self.letters.to_words(self.letters.candidates(self._constraints(request)))
+        return {"count": len(words), "words": words}
+
+    async def worst_solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        target = request["target"].casefold()
+        guesses = tuple(guess.casefold() for guess in request.get("guesses", []))
+        for word in (target, *guesses):
+            if word not in self.candidates.ids:
+                raise ValueError(f"'{word}' is not in the word list")
+
+        target_id = self.candidates.ids[target]
+        remaining = self.candidates.all
+        for i, guess in enumerate(guesses):
+            # the search ends the chain with the target, so the guesses leading up to it can't include it
+            if guess == target:
+                raise ValueError(f"guess {i + 1} is the target '{target}', which can only end the chain")
+            guess_id = self.candidates.ids[guess]
+            if not remaining >> guess_id & 1:
+                raise ValueError(f"guess {i + 1} ('{guess}') is not legal in hard mode after the guesses before it")
+            remaining = self.candidates.child(remaining, guess_id, target_id)
+        if remaining.bit_count() > self.max_candidates:
+            raise ValueError(
+                f"{remaining.bit_count()} candidates is more than this service searches ({self.max_candidates}), "
+                "give more guesses to narrow it down"
+            )
+
+        chain, elapsed = await asyncio.get_running_loop().run_in_executor(self.pool, _worst_solve, target, guesses)
+        return {"chain": chain, "length": len(chain), "elapsed": round(elapsed, 6)}
+
+    async def handle(self, line: str) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {"error": f"invalid JSON: {e}"}
+        if not isinstance(request, dict):
+            return {"error": "requests must be JSON objects"}
+
+        response: Dict[str, Any] = {"id": request["id"]} if "id" in request else dict()
+        op = self._ops.get(request.get("op"))
+        if op is None:
+            response["error"] = f"unrecognized op '{request.get('op')}', expected one of {sorted(self._ops)}"
+            return response
+        try:
+            response.update(await op(request))
+        except Exception as e:
+            # anything a request can make go wrong, worker failures included, is reported on its
+            # id rather than left to kill the task and the client waiting
+            response["error"] = f"{type(e).__name__}: {e}"
+        return response
+
+    # answers every line read until EOF, each in its own task so slow searches don't hold up
+    # quick lookups behind them
+    async def serve(self, reader: asyncio.StreamReader, write: Write) -> None:
+        async def respond(line: str) -> None:
+            await write(json.dumps(await self.handle(line)) + "\n")
+
+        tasks = set()
+        while line := (await reader.readline()).decode():
+            if not line.strip():
+                continue
+            task = asyncio.create_task(respond(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def serve_stdio(self) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        async def write(text: str) -> None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        await self.serve(reader, write)
+
+    async def serve_socket(self, path: Path) -> None:
+        async def connected(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            async def write(text: str) -> None:
+                writer.write(text.encode())
+                await writer.drain()
+
+            try:
+                await self.serve(reader, write)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(connected, path)
+        logger.info("listening on %s", path)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    from wordle.compiled import CompiledWordlist
+
+    logging.basicConfig(level=logging.INFO)
+    parser = ArgumentParser(description="answer scoring, legal guess and worst solve queries as JSON lines, keeping the word data loaded")
+    parser.add_argument("wordlist", type=Path, help="wordlist file")
+    parser.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix")
+    parser.add_argument("-p", "--processes", type=int, help="worker processes for worst solve searches")
+    parser.add_argument("-S", "--socket", type=Path, help="listen on this unix socket instead of stdin and stdout")
+    parser.add_argument("--max-candidates", type=int, default=500, help="refuse worst solve searches over more candidates than this")
+    parser.add_argument("-t", "--table-size", type=int, default=TABLE_SIZE, help="MiB of transposition table per worker (0 disables)")
+    parser.add_argument("-m", "--memory-budget", type=int, default=MEMORY_BUDGET >> 20, help="MiB of cached partitions and compatibility graphs per process")
+    args = parser.parse_args()
+
+    compiled = CompiledWordlist.load(args.wordlist, args.cache_dir)
+    words = compiled.words
+    feedback = FeedbackMatrix.load(words, args.cache_dir)
+    service = Service(words, feedback, args.processes, args.max_candidates, args.table_size, args.memory_budget << 20, compiled.letter_index())
+    logger.info("serving %d words from %s", len(words), args.wordlist)
+    try:
+        asyncio.run(service.serve_socket(args.socket) if args.socket is not None else service.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
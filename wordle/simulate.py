@@ -0,0 +1,190 @@
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+import json
+import logging
+from multiprocessing import Pool
+from pathlib import Path
+import random
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from wordle.feedback import FeedbackMatrix
+from wordle.lib import load_words
+from wordle.strategies import STRATEGIES, execute_strategy, load_decision_tree
+from wordle.wordle import Wordle
+
+logger = logging.getLogger(__name__)
+
+# strategy, seed and the targets to play with it
+Batch = Tuple[str, int, Tuple[str, ...]]
+
+
+@dataclass()
+class StrategyReport:
+    strategy: str
+    # games taking each number of guesses
+    distribution: Dict[int, int] = field(default_factory=dict)
+    # time spent playing, summed over every process
+    elapsed_ns: int = 0
+
+    @property
+    def games(self) -> int:
+        return sum(self.distribution.values())
+
+    @property
+    def mean(self) -> float:
+        return sum(count * games for count, games in self.distribution.items()) / self.games if self.games else 0.0
+
+    @property
+    def worst(self) -> int:
+        return max(self.distribution, default=0)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / (self.elapsed_ns / 1e9) if self.elapsed_ns else 0.0
+
+    def percentile(self, p: float) -> int:
+        rank = p * self.games
+        seen = 0
+        for count, games in sorted(self.distribution.items()):
+            seen += games
+            if seen >= rank:
+                return count
+        return 0
+
+    def add(self, counts: Iterable[int], elapsed_ns: int) -> None:
+        for count in counts:
+            self.distribution[count] = self.distribution.get(count, 0) + 1
+        self.elapsed_ns += elapsed_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "games": self.games,
+            "mean": self.mean,
+            "median": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "worst": self.worst,
+            "games_per_second": self.games_per_second,
+            "distribution": {str(count): games for count, games in sorted(self.distribution.items())},
+        }
+
+    # the distribution in at most `bins` ranges of guess counts, as (lowest, highest, games)
+    def histogram(self, bins: int = 12) -> List[Tuple[int, int, int]]:
+        if not self.distribution:
+            return []
+        lowest = min(self.distribution)
+        width = -(-(self.worst - lowest + 1) // bins)
+        histogram: Dict[int, int] = dict()
+        for count, games in self.distribution.items():
+            start = lowest + (count - lowest) // width * width
+            histogram[start] = histogram.get(start, 0) + games
+        return [(start, start + width - 1, games) for start, games in sorted(histogram.items())]
+
+
+# words and feedback matrix for each worker, sent once through the pool initializer
+_words: Sequence[str] = ()
+_feedback: Optional[FeedbackMatrix] = None
+
+
+def _init_worker(words: Sequence[str], feedback: Optional[FeedbackMatrix], tree_cache_dir: Optional[Path] = None) -> None:
+    global _words, _feedback
+    _words = words
+    _feedback = feedback
+    if tree_cache_dir is not None:
+        # decision_tree_guess then plays the cached tree rather than building its own
+        load_decision_tree(words, tree_cache_dir)
+
+
+def play(batch: Batch) -> Tuple[str, List[int], int]:
+    strategy, seed, targets = batch
+    counts = list()
+    start = perf_counter_ns()
+    for target in targets:
+        # seeded per game, so results don't depend on how games are batched across processes
+        random.seed(f"{seed}:{target}")
+        counts.append(execute_strategy(Wordle(target, feedback=_feedback), STRATEGIES[strategy](_words)))
+    return strategy, counts, perf_counter_ns() - start
+
+
+def batches(strategies: Iterable[str], seeds: Iterable[int], targets: Sequence[str], size: int) -> List[Batch]:
+    return [
+        (strategy, seed, tuple(targets[i : i + size]))
+        for strategy in strategies
+        for seed in seeds
+        for i in range(0, len(targets), size)
+    ]
+
+
+def simulate(
+    words: Sequence[str],
+    strategies: Sequence[str],
+    seeds: Sequence[int],
+    targets: Optional[Sequence[str]] = None,
+    processes: Optional[int] = None,
+    feedback: Optional[FeedbackMatrix] = None,
+    batch_size: int = 64,
+    cache_dir: Optional[Path] = None,
+) -> Dict[str, StrategyReport]:
+    reports = {strategy: StrategyReport(strategy) for strategy in strategies}
+    work = batches(strategies, seeds, targets if targets is not None else words, batch_size)
+    tree_cache_dir = cache_dir if "decision_tree_guess" in strategies else None
+    if tree_cache_dir is not None:
+        # built here first, so workers load it rather than each building and saving it at once
+        load_decision_tree(words, tree_cache_dir)
+
+    if not processes or processes == 1:
+        _init_worker(words, feedback, tree_cache_dir)
+        results: Iterable[Tuple[str, List[int], int]] = map(play, work)
+        for strategy, counts, elapsed_ns in results:
+            reports[strategy].add(counts, elapsed_ns)
+    else:
+        with Pool(processes=processes, initializer=_init_worker, initargs=(words, feedback, tree_cache_dir)) as pool:
+            for strategy, counts, elapsed_ns in pool.imap_unordered(play, work):
+                reports[strategy].add(counts, elapsed_ns)
+    return reports
+
+
+def build_arg_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="play every target with each strategy and report how many guesses they take")
+    parser.add_argument("wordlist", type=Path, help="wordlist file")
+    parser.add_argument("-S", "--strategies", nargs="+", choices=sorted(STRATEGIES), default=sorted(STRATEGIES), help="strategies to simulate")
+    parser.add_argument("-s", "--seeds", type=int, nargs="+", default=[0], help="play every target once per seed")
+    parser.add_argument("-l", "--limit", type=int, help="only play the first l targets of a seeded shuffle")
+    parser.add_argument("-p", "--processes", type=int, help="run across p processes")
+    parser.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix and decision tree")
+    parser.add_argument("-o", "--output", type=Path, help="write the reports to this JSON file")
+    return parser
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = build_arg_parser().parse_args()
+
+    words = load_words(args.wordlist)
+    logger.info("loaded %d words from %s", len(words), args.wordlist)
+    feedback = FeedbackMatrix.load(words, args.cache_dir)
+    targets = words
+    if args.limit is not None:
+        targets = random.Random(args.seeds[0]).sample(words, args.limit)
+
+    start = perf_counter_ns()
+    reports = simulate(words, args.strategies, args.seeds, targets, args.processes, feedback, cache_dir=args.cache_dir)
+    elapsed = (perf_counter_ns() - start) / 1e9
+    games = sum(report.games for report in reports.values())
+    logger.info("played %d games in %.1fs (%.0f games/sec)", games, elapsed, games / elapsed)
+
+    print(f"{'strategy':24} {'games':>7} {'mean':>8} {'median':>7} {'p90':>6} {'worst':>6} {'games/sec':>10}")
+    for report in reports.values():
+        print(
+            f"{report.strategy:24} {report.games:7d} {report.mean:8.2f} {report.percentile(0.5):7d} "
+            f"{report.percentile(0.9):6d} {report.worst:6d} {report.games_per_second:10.1f}"
+        )
+    for report in reports.values():
+        print(f"\n{report.strategy} guesses:")
+        for low, high, games in report.histogram():
+            label = str(low) if low == high else f"{low}-{high}"
+            print(f"  {label:>11} {games:7d} {'#' * round(60 * games / report.games)}")
+    if args.output is not None:
+        args.output.write_text(json.dumps([report.to_dict() for report in reports.values()], indent=2))
+        logger.info("wrote reports to %s", args.output)
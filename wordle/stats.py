@@ -0,0 +1,145 @@
+from __future__ import annotations
+import cProfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from logging import getLogger
+from pathlib import Path
+import pstats
+from time import monotonic
+import tracemalloc
+from typing import Any, Dict, Iterator, Optional
+
+logger = getLogger(__name__)
+
+
+def _add(into: Dict[Any, int], other: Dict[Any, int]) -> None:
+    for key, count in other.items():
+        into[key] = into.get(key, 0) + count
+
+
+# counters kept by the search while it runs. child sizes are bucketed by powers of two, and the time
+# at each depth includes the subtrees below it
+@dataclass()
+class SearchStats:
+    nodes: Dict[int, int] = field(default_factory=dict)
+    time_ns: Dict[int, int] = field(default_factory=dict)
+    child_sizes: Dict[int, int] = field(default_factory=dict)
+    prunes: Dict[str, int] = field(default_factory=dict)
+    leaves: int = 0
+    table_lookups: int = 0
+    table_hits: int = 0
+
+    @property
+    def total_nodes(self) -> int:
+        return sum(self.nodes.values())
+
+    @property
+    def table_hit_rate(self) -> float:
+        return self.table_hits / self.table_lookups if self.table_lookups else 0.0
+
+    def merge(self, other: SearchStats) -> None:
+        _add(self.nodes, other.nodes)
+        _add(self.time_ns, other.time_ns)
+        _add(self.child_sizes, other.child_sizes)
+        _add(self.prunes, other.prunes)
+        self.leaves += other.leaves
+        self.table_lookups += other.table_lookups
+        self.table_hits += other.table_hits
+
+    # returns the counts so far and starts again from zero, so workers can send back what each task added
+    def take(self) -> SearchStats:
+        taken = SearchStats(
+            dict(self.nodes),
+            dict(self.time_ns),
+            dict(self.child_sizes),
+            dict(self.prunes),
+            self.leaves,
+            self.table_lookups,
+            self.table_hits,
+        )
+        self.nodes.clear()
+        self.time_ns.clear()
+        self.child_sizes.clear()
+        self.prunes.clear()
+        self.leaves = self.table_lookups = self.table_hits = 0
+        return taken
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_nodes": self.total_nodes,
+            "nodes": {str(depth): n for depth, n in sorted(self.nodes.items())},
+            "time_s": {str(depth): ns / 1e9 for depth, ns in sorted(self.time_ns.items())},
+            "child_sizes": {f"<={size}": n for size, n in sorted(self.child_sizes.items())},
+            "prunes": dict(sorted(self.prunes.items())),
+            "leaves": self.leaves,
+            "table_lookups": self.table_lookups,
+            "table_hits": self.table_hits,
+            "table_hit_rate": self.table_hit_rate,
+        }
+
+    def __str__(self) -> str:
+        prunes = ", ".join(f"{n} {reason}" for reason, n in sorted(self.prunes.items())) or "none"
+        return (
+            f"{self.total_nodes} nodes to depth {max(self.nodes, default=0)}, {self.leaves} leaves, "
+            f"prunes: {prunes}, {self.table_hits}/{self.table_lookups} table hits ({self.table_hit_rate:.1%})"
+        )
+
+
+# logs how far through a run we are, with an estimate of when it will finish, at most once per interval
+class Progress:
+    def __init__(self, total: int, unit: str, interval: float = 30.0):
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.done = 0
+        self._start = monotonic()
+        self._last_log = self._start
+
+    def update(self, count: int = 1, detail: Any = None) -> None:
+        self.done += count
+        now = monotonic()
+        if now - self._last_log < self.interval and self.done < self.total:
+            return
+        self._last_log = now
+
+        elapsed = now - self._start
+        eta = "unknown"
+        if self.done:
+            eta = str(timedelta(seconds=round(elapsed / self.done * (self.total - self.done))))
+        logger.info(
+            "%d/%d %s (%.1f%%) in %s, eta %s%s",
+            self.done,
+            self.total,
+            self.unit,
+            100 * self.done / self.total if self.total else 100.0,
+            timedelta(seconds=round(elapsed)),
+            eta,
+            f": {detail}" if detail is not None else "",
+        )
+
+
+# profiles the body with cProfile (saved to profile_path, to be read with pstats or snakeviz) and/or
+# traces its allocations with tracemalloc, logging the hottest functions and largest allocation sites
+@contextmanager
+def profiled(profile_path: Optional[Path] = None, trace_memory: bool = False, top: int = 20) -> Iterator[None]:
+    profiler = cProfile.Profile() if profile_path is not None else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            logger.info("saved profile to %s", profile_path)
+            pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            logger.info("traced memory: %.1f MiB current, %.1f MiB peak", current / 2**20, peak / 2**20)
+            for stat in snapshot.statistics("lineno")[:top]:
+                logger.info("%s", stat)
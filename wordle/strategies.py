@@ -1,34 +1,43 @@
 __all__ = [
+    "STRATEGIES",
     "execute_strategy",
+    "decision_tree_guess",
+    "load_decision_tree",
+    "add_letter_index",
     "exhaustive_guess",
     "legal_hard_mode_guess",
     "Strategy",
 ]
 
-from collections import defaultdict, Counter
-from logging import getLogger
+from logging import DEBUG, getLogger
+from pathlib import Path
 import random
-from typing import Sequence, Collection, Generator, Dict, Set
+from typing import Callable, Dict, Optional, Collection, Generator, Tuple
 
+from wordle.feedback import FeedbackMatrix, all_correct_code, decode
+from wordle.index import LetterIndex
 from wordle.lib import colored_text
-from wordle.wordle import CharResult, Wordle, Constraint
+from wordle.tree import DecisionTree
+from wordle.wordle import Wordle, ConstraintState
 
 logger = getLogger(__name__)
 
 
-Strategy = Generator[str, Sequence[CharResult], None]
+# strategies are sent the pattern code of each guess, and only decode it to show it
+Strategy = Generator[str, int, None]
 
 
 def execute_strategy(wordle: Wordle, strat: Strategy) -> int:
     count = 1
     guess = next(strat)
-    result = wordle.make_guess(guess)
-    while not CharResult.all_correct(result):
-        logger.debug("guess %d: %s", count, colored_text(guess, result))
+    code = wordle.make_guess_code(guess)
+    while code != wordle.all_correct:
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("guess %d: %s", count, colored_text(guess, decode(code, len(guess))))
 
         count += 1
-        guess = strat.send(result)
-        result = wordle.make_guess(guess)
+        guess = strat.send(code)
+        code = wordle.make_guess_code(guess)
 
     return count
 
@@ -37,64 +46,88 @@ def exhaustive_guess(possibilities: Collection[str]) -> Strategy:
     possibilities = list(possibilities)
     random.shuffle(possibilities)
     for possibility in possibilities:
-        result = yield possibility
-        assert not CharResult.all_correct(result)
+        code = yield possibility
+        assert code != all_correct_code(len(possibility))
 
 
 class _HardModeConstraintTracker:
     def __init__(self):
-        self.constraints: Dict[str, Constraint] = dict()
+        self.constraints = ConstraintState()
 
-    def update(self, guess: str, result: Sequence[CharResult]) -> None:
-        char_indexes: Dict[str, Set[int]] = defaultdict(set)
-        for index, char in enumerate(guess):
-            char_indexes[char].add(index)
+    def update(self, guess: str, code: int) -> None:
+        self.constraints = self.constraints.update_code(guess, code)
 
-        for char, indexes in char_indexes.items():
-            old_constraint = self.constraints.get(char)
-            new_constraint = Constraint.from_result(indexes, result)
+    def is_legal(self, guess: str) -> bool:
+        return self.constraints.is_legal(guess)
 
-            if old_constraint:
-                old_constraint.update(new_constraint)
-            else:
-                self.constraints[char] = new_constraint
 
-    def is_legal(self, guess: str) -> bool:
-        char_counts = Counter(guess)
-        for char, constraint in self.constraints.items():
-            count = char_counts[char]
-            wrong_count = (
-                count != constraint.min_count
-                if constraint.min_is_exact
-                else count < constraint.min_count
-            )
-            missing_known_positions = any(
-                guess[index] != char for index in constraint.known_positions
-            )
-            present_known_not_positions = any(
-                guess[index] == char for index in constraint.known_not_positions
-            )
-            if wrong_count or missing_known_positions or present_known_not_positions:
-                return False
-
-        return True
+# letter indexes by word list, each built once per process unless one was added ready-made
+_letter_indexes: Dict[Tuple[str, ...], LetterIndex] = dict()
+
+
+# lets legal_hard_mode_guess use an index built elsewhere, such as one read from a compiled wordlist
+def add_letter_index(index: LetterIndex) -> None:
+    _letter_indexes[tuple(index.words)] = index
+
+
+def _letter_index(words: Tuple[str, ...]) -> LetterIndex:
+    index = _letter_indexes.get(words)
+    if index is None:
+        index = _letter_indexes[words] = LetterIndex(words)
+    return index
 
 
 def legal_hard_mode_guess(possibilities: Collection[str]) -> Strategy:
     possibilities = list(possibilities)
+    index = _letter_index(tuple(possibilities))
     constraint_tracker = _HardModeConstraintTracker()
 
     guess = random.choice(possibilities)
-    result = yield guess
-    while not CharResult.all_correct(result):
-        constraint_tracker.update(guess, result)
-        possibilities = [
-            possibility
-            for possibility in possibilities
-            if constraint_tracker.is_legal(possibility)
-        ]
+    code = yield guess
+    while code != all_correct_code(len(guess)):
+        constraint_tracker.update(guess, code)
+        possibilities = index.to_words(index.candidates(constraint_tracker.constraints))
         logger.debug("filtered to %d possibilities", len(possibilities))
         assert possibilities
 
         guess = random.choice(possibilities)
-        result = yield guess
+        code = yield guess
+
+
+# decision trees by word list, each built or loaded once per process
+_trees: Dict[Tuple[str, ...], DecisionTree] = dict()
+
+
+# the tree decision_tree_guess plays for possibilities, loaded from (or built and saved to) cache_dir
+# if given, otherwise built in memory
+def load_decision_tree(possibilities: Collection[str], cache_dir: Optional[Path] = None) -> DecisionTree:
+    words = tuple(sorted(possibilities))
+    tree = _trees.get(words)
+    if tree is None:
+        if cache_dir is not None:
+            tree = DecisionTree.load(FeedbackMatrix.load(words, cache_dir), cache_dir)
+        else:
+            tree = DecisionTree.build(FeedbackMatrix.build(words))
+        _trees[words] = tree
+    return tree
+
+
+def decision_tree_guess(possibilities: Collection[str], tree: Optional[DecisionTree] = None) -> Strategy:
+    if tree is None:
+        tree = load_decision_tree(possibilities)
+
+    node: Optional[int] = 0
+    while node is not None:
+        guess = tree.guess(node)
+        code = yield guess
+        assert code != all_correct_code(len(guess))
+        node = tree.child(node, code)
+    raise ValueError("no word in the decision tree matches the results so far")
+
+
+# every strategy by name, each built from the words it may guess
+STRATEGIES: Dict[str, Callable[[Collection[str]], Strategy]] = {
+    "decision_tree_guess": decision_tree_guess,
+    "exhaustive_guess": exhaustive_guess,
+    "legal_hard_mode_guess": legal_hard_mode_guess,
+}
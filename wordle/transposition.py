@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+import sys
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# MiB of transposition table each process keeps by default
+TABLE_SIZE = 256
+
+
+@dataclass()
+class TableStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: Optional[int] = None
+    bytes: int = 0
+    max_bytes: Optional[int] = None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        d = asdict(self)
+        d["hit_rate"] = self.hit_rate
+        return d
+
+    def __str__(self) -> str:
+        size = f"{self.size}/{self.max_entries} entries" if self.max_entries is not None else f"{self.size} entries"
+        if self.max_bytes is not None:
+            size += f", {self.bytes / (1 << 20):.1f}/{self.max_bytes / (1 << 20):.1f}MiB"
+        return (
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%} hit rate), "
+            f"{self.stores} stores, {self.evictions} evictions, {size}"
+        )
+
+
+# roughly the bytes an entry keeps alive: its key and value, and the objects directly inside them when
+# they are tuples. strings are left out, since they are the word list's own
+def entry_bytes(key: Any, value: Any) -> int:
+    size = 0
+    for obj in (key, value):
+        size += sys.getsizeof(obj)
+        if isinstance(obj, tuple):
+            size += sum(sys.getsizeof(item) for item in obj if not isinstance(item, str))
+    return size
+
+
+# bounded memo of solved search nodes, evicting the least recently used entries when it holds more
+# than max_entries, or more than max_bytes (as entry_bytes counts them)
+class TranspositionTable(Generic[K, V]):
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        if max_entries is None and max_bytes is None:
+            raise ValueError("table needs a limit on its entries or its bytes")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f"table must hold at least one entry, not {max_entries}")
+
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._bytes: Dict[K, int] = dict()
+        self._stats = TableStats(max_entries=max_entries, max_bytes=max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        value = self._entries.get(key)
+        if value is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._stats.stores += 1
+        if self._stats.max_bytes is not None:
+            size = entry_bytes(key, value)
+            self._stats.bytes += size - self._bytes.get(key, 0)
+            self._bytes[key] = size
+
+        max_entries, max_bytes = self._stats.max_entries, self._stats.max_bytes
+        while self._entries and (
+            max_entries is not None and len(self._entries) > max_entries
+            or max_bytes is not None and self._stats.bytes > max_bytes
+        ):
+            oldest, _ = self._entries.popitem(last=False)
+            self._stats.bytes -= self._bytes.pop(oldest, 0)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes.clear()
+        self._stats.bytes = 0
+
+    @property
+    def stats(self) -> TableStats:
+        self._stats.size = len(self._entries)
+        return TableStats(**asdict(self._stats))
+
+
+# a table of table_size MiB, or none when it is 0
+def sized_table(table_size: int) -> Optional[TranspositionTable]:
+    return TranspositionTable(max_bytes=table_size << 20) if table_size else None
@@ -0,0 +1,218 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from collections import Counter
+from functools import cache
+import logging
+from math import log2
+import mmap
+from pathlib import Path
+import struct
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Sequence
+
+from wordle.feedback import FeedbackMatrix, all_correct_code, words_digest
+from wordle.lib import atomic_write
+
+logger = logging.getLogger(__name__)
+
+CRITERIA = ("minimax", "entropy")
+
+_MAGIC = b"EDTR"
+_VERSION = 2
+# magic, version, word length, criterion, hard mode, word count, node count, edge count
+_HEADER = struct.Struct("<4sBBBBHII")
+
+
+# a game plan built offline: each node holds the guess to make there and, for each pattern the
+# guess can get back (other than all correct), the node to continue from
+class DecisionTree:
+    def __init__(
+        self,
+        words: Sequence[str],
+        guesses: Sequence[int],
+        children: Sequence[Dict[int, int]],
+        criterion: str,
+        hard_mode: bool,
+    ):
+        if len(guesses) != len(children):
+            raise ValueError(f"expected children for {len(guesses)} nodes, found {len(children)}")
+        if criterion not in CRITERIA:
+            raise ValueError(f"unrecognized criterion '{criterion}'")
+
+        self.words = list(words)
+        self.guesses = list(guesses)
+        self.children = list(children)
+        self.criterion = criterion
+        self.hard_mode = hard_mode
+
+    def __len__(self) -> int:
+        return len(self.guesses)
+
+    def guess(self, node: int) -> str:
+        return self.words[self.guesses[node]]
+
+    # the node to play after the node's guess got back code, or None if no target gets that pattern
+    def child(self, node: int, code: int) -> Optional[int]:
+        return self.children[node].get(code)
+
+    # the guesses the tree makes for target, ending with the target
+    def play(self, target: str, feedback: FeedbackMatrix) -> List[str]:
+        target_id = feedback.index[target]
+        all_correct = all_correct_code(len(target))
+        played: List[str] = list()
+        node: Optional[int] = 0
+        while node is not None:
+            played.append(self.guess(node))
+            code = feedback.code(feedback.index[played[-1]], target_id)
+            if code == all_correct:
+                return played
+            node = self.child(node, code)
+        raise ValueError(f"'{target}' is not a target of this tree")
+
+    @staticmethod
+    def build(feedback: FeedbackMatrix, criterion: str = "minimax", hard_mode: bool = False) -> DecisionTree:
+        if criterion not in CRITERIA:
+            raise ValueError(f"unrecognized criterion '{criterion}'")
+
+        start = perf_counter_ns()
+        words = feedback.words
+        all_correct = all_correct_code(len(words[0])) if words else 0
+        rows = [list(feedback.row(guess_id)) for guess_id in range(len(words))]
+        guesses: List[int] = list()
+        children: List[Dict[int, int]] = list()
+
+        def cost(guess_id: int, candidates: List[int]) -> float:
+            sizes = Counter(map(rows[guess_id].__getitem__, candidates)).values()
+            if criterion == "minimax":
+                return max(sizes)
+            # minimizing the expected log of the bucket size maximizes the guess's entropy
+            return sum(size * log2(size) for size in sizes)
+
+        def build_node(candidates: List[int]) -> int:
+            node = len(guesses)
+            guesses.append(0)
+            children.append(dict())
+
+            if len(candidates) <= 2:
+                guess_id = candidates[0]
+            else:
+                # in hard mode only the candidates are legal. otherwise any word may split them better,
+                # with ties going to candidates since those might win outright
+                pool = candidates if hard_mode else range(len(words))
+                is_candidate = set(candidates)
+                guess_id = min(pool, key=lambda g: (cost(g, candidates), g not in is_candidate, g))
+            guesses[node] = guess_id
+
+            buckets: Dict[int, List[int]] = dict()
+            row = rows[guess_id]
+            for target_id in candidates:
+                code = row[target_id]
+                if code != all_correct:
+                    buckets.setdefault(code, list()).append(target_id)
+            for code, bucket in sorted(buckets.items()):
+                children[node][code] = build_node(bucket)
+            return node
+
+        if words:
+            build_node(list(range(len(words))))
+        elapsed_ms = (perf_counter_ns() - start) / 1_000_000
+        logger.info("built %s decision tree with %d nodes in %.0fms", criterion, len(guesses), elapsed_ms)
+        return DecisionTree(words, guesses, children, criterion, hard_mode)
+
+    # nodes are written as parallel u16 arrays (guess and number of children), followed by every node's
+    # (u16 code, u32 child) edges in node order
+    def save(self, path: Path) -> None:
+        if len(self.words) > 0xFFFF:
+            raise ValueError(f"decision trees hold at most {0xFFFF} words, not {len(self.words)}")
+
+        word_length = len(self.words[0]) if self.words else 0
+        edges = [(code, child) for children in self.children for code, child in sorted(children.items())]
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            word_length,
+            CRITERIA.index(self.criterion),
+            self.hard_mode,
+            len(self.words),
+            len(self.guesses),
+            len(edges),
+        )
+
+        with atomic_write(path) as f:
+            f.write(header)
+            f.write("".join(self.words).encode("ascii"))
+            f.write(struct.pack(f"<{len(self.guesses)}H", *self.guesses))
+            f.write(struct.pack(f"<{len(self.children)}H", *(len(children) for children in self.children)))
+            f.write(struct.pack(f"<{len(edges)}H", *(code for code, _ in edges)))
+            f.write(struct.pack(f"<{len(edges)}I", *(child for _, child in edges)))
+
+    @staticmethod
+    @cache
+    def open(path: Path) -> DecisionTree:
+        with path.open("rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, word_length, criterion, hard_mode, word_count, node_count, edge_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"'{path}' is not a version {_VERSION} decision tree")
+
+        offset = _HEADER.size
+        table = data[offset : offset + word_length * word_count].decode("ascii")
+        words = [table[i : i + word_length] for i in range(0, len(table), word_length)]
+        offset += word_length * word_count
+        guesses = struct.unpack_from(f"<{node_count}H", data, offset)
+        offset += 2 * node_count
+        counts = struct.unpack_from(f"<{node_count}H", data, offset)
+        offset += 2 * node_count
+        codes = struct.unpack_from(f"<{edge_count}H", data, offset)
+        offset += 2 * edge_count
+        nodes = struct.unpack_from(f"<{edge_count}I", data, offset)
+
+        children: List[Dict[int, int]] = list()
+        edge = 0
+        for count in counts:
+            children.append(dict(zip(codes[edge : edge + count], nodes[edge : edge + count])))
+            edge += count
+        return DecisionTree(words, guesses, children, CRITERIA[criterion], bool(hard_mode))
+
+    @staticmethod
+    def load(feedback: FeedbackMatrix, cache_dir: Path, criterion: str = "minimax", hard_mode: bool = False) -> DecisionTree:
+        mode = "hard" if hard_mode else "normal"
+        path = cache_dir / f"tree-{criterion}-{mode}-{words_digest(feedback.words)[:16]}.bin"
+        if path.exists():
+            tree = DecisionTree.open(path)
+            if tree.words == feedback.words and tree.criterion == criterion and tree.hard_mode == hard_mode:
+                logger.info("loaded decision tree from %s", path)
+                return tree
+            logger.warning("decision tree %s does not match word list, rebuilding", path)
+            DecisionTree.open.cache_clear()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        DecisionTree.build(feedback, criterion, hard_mode).save(path)
+        logger.info("saved decision tree to %s", path)
+        return DecisionTree.open(path)
+
+
+if __name__ == "__main__":
+    from wordle.lib import load_words
+
+    logging.basicConfig(level=logging.INFO)
+    parser = ArgumentParser(description="build the decision tree played by the decision_tree_guess strategy")
+    parser.add_argument("wordlist", type=Path, help="wordlist file")
+    parser.add_argument("-C", "--criterion", choices=CRITERIA, default="minimax", help="how guesses are chosen at each node")
+    parser.add_argument("--hard-mode", action="store_true", help="only guess words consistent with every previous result")
+    parser.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix and tree")
+    args = parser.parse_args()
+
+    words = load_words(args.wordlist)
+    feedback = FeedbackMatrix.load(words, args.cache_dir)
+    tree = DecisionTree.load(feedback, args.cache_dir, args.criterion, args.hard_mode)
+    counts = [len(tree.play(word, feedback)) for word in words]
+    logger.info(
+        "%s tree opens with %s and solves %d words in %.3f guesses on average, %d at worst",
+        tree.criterion,
+        tree.guess(0),
+        len(words),
+        sum(counts) / len(counts),
+        max(counts),
+    )
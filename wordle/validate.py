@@ -0,0 +1,145 @@
+from argparse import ArgumentParser
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import sys
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from wordle.feedback import FeedbackMatrix, all_correct_code
+from wordle.wordle import ConstraintState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Verdict:
+    line: int
+    # in play order, ending with the target
+    chain: Tuple[str, ...]
+    # the position in chain of the first guess breaking the rules, and the rule it breaks
+    index: Optional[int] = None
+    reason: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.reason is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {"line": self.line, "chain": list(self.chain), "valid": self.valid}
+        if not self.valid:
+            d["index"] = self.index
+            d["guess"] = self.chain[self.index] if self.index is not None else None
+            d["reason"] = self.reason
+        return d
+
+
+# empty fields are kept (as empty words), so a malformed chain like "track,,tiger" fails validation
+def parse_chain(line: str) -> Tuple[str, ...]:
+    if not line.strip():
+        return ()
+    return tuple(word.strip().casefold() for word in line.split(","))
+
+
+# a guess is a potential winner exactly when every earlier guess would have gotten the same pattern
+# against it as against the target, so chains of known words are checked with pattern lookups alone.
+# constraint states are only replayed to explain a guess that fails
+class Validator:
+    def __init__(self, feedback: FeedbackMatrix):
+        self.feedback = feedback
+        self.index = feedback.index
+        self.word_length = len(feedback.words[0]) if feedback.words else 0
+
+    def check(self, chain: Sequence[str]) -> Optional[Tuple[Optional[int], str]]:
+        if not chain:
+            return None, "chain is empty"
+
+        ids: List[int] = list()
+        for i, word in enumerate(chain):
+            word_id = self.index.get(word)
+            if word_id is None:
+                if not word:
+                    return i, f"guess {i + 1} is empty"
+                if len(word) != self.word_length:
+                    return i, f"'{word}' does not match word length ({self.word_length})"
+                return i, f"'{word}' is not in the word list"
+            ids.append(word_id)
+
+        code = self.feedback.code
+        target_id = ids[-1]
+        all_correct = all_correct_code(self.word_length)
+        patterns: List[int] = list()
+        for i, guess_id in enumerate(ids):
+            for j, pattern in enumerate(patterns):
+                if code(ids[j], guess_id) != pattern:
+                    return i, self._violation(chain, i)
+            pattern = code(guess_id, target_id)
+            if pattern == all_correct and i != len(ids) - 1:
+                return i, f"'{chain[i]}' is the target, so the game ends at guess {i + 1}"
+            patterns.append(pattern)
+        return None
+
+    def _violation(self, chain: Sequence[str], i: int) -> str:
+        target = chain[-1]
+        state = ConstraintState()
+        for guess in chain[:i]:
+            state = state.update_code(guess, self.feedback.pattern(guess, target))
+        message = state.violation(chain[i])
+        assert message is not None
+        return message
+
+    def validate(self, lines: Iterable[str]) -> Iterator[Verdict]:
+        for number, line in enumerate(lines, start=1):
+            chain = parse_chain(line)
+            if not chain:
+                continue
+            failure = self.check(chain)
+            if failure is None:
+                yield Verdict(number, chain)
+            else:
+                yield Verdict(number, chain, *failure)
+
+
+if __name__ == "__main__":
+    from wordle.compiled import CompiledWordlist
+
+    logging.basicConfig(level=logging.INFO)
+    parser = ArgumentParser(description="check files of comma separated eldrow chains against the hard mode rules")
+    parser.add_argument("wordlist", type=Path, help="wordlist file")
+    parser.add_argument("chains", type=Path, nargs="+", help="files with one chain per line, in play order and ending with the target")
+    parser.add_argument("-c", "--cache-dir", type=Path, default=Path(".eldrow-cache"), help="directory for the precomputed feedback matrix")
+    parser.add_argument("-o", "--output", type=Path, help="write a JSON line for every chain to this file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't print the invalid chains")
+    args = parser.parse_args()
+
+    words = CompiledWordlist.load(args.wordlist, args.cache_dir).words
+    validator = Validator(FeedbackMatrix.load(words, args.cache_dir))
+
+    output = args.output.open("w") if args.output is not None else None
+    checked = 0
+    invalid = 0
+    longest: Tuple[str, ...] = ()
+    start = perf_counter_ns()
+    for path in args.chains:
+        with path.open() as f:
+            for verdict in validator.validate(f):
+                checked += 1
+                if output is not None:
+                    output.write(json.dumps(verdict.to_dict()) + "\n")
+                if verdict.valid:
+                    if len(verdict.chain) > len(longest):
+                        longest = verdict.chain
+                    continue
+                invalid += 1
+                if not args.quiet:
+                    guess = f" at '{verdict.chain[verdict.index]}'" if verdict.index is not None else ""
+                    print(f"{path}:{verdict.line}: {','.join(verdict.chain)}{guess}: {verdict.reason}")
+    elapsed = (perf_counter_ns() - start) / 1e9
+    if output is not None:
+        output.close()
+
+    logger.info("checked %d chains in %.2fs (%.0f chains/sec): %d valid, %d invalid", checked, elapsed, checked / elapsed if elapsed else 0.0, checked - invalid, invalid)
+    if longest:
+        logger.info("longest valid chain (%d guesses): %s", len(longest), ",".join(longest))
+    sys.exit(1 if invalid else 0)
@@ -1,10 +1,11 @@
 from __future__ import annotations
-from collections import Counter, defaultdict
-from copy import copy
+from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
-from functools import cache
+from functools import cache, lru_cache
+from itertools import compress
 from typing import (
+    TYPE_CHECKING,
     Dict,
     Iterable,
     Iterator,
@@ -17,6 +18,9 @@ from typing import (
     Mapping,
 )
 
+if TYPE_CHECKING:
+    from wordle.feedback import FeedbackMatrix
+
 
 class CharResult(Enum):
     Gray = "X"
@@ -31,27 +35,77 @@ class CharResult(Enum):
     def all_correct(results: Iterator[CharResult]) -> bool:
         return all(cr == CharResult.Green for cr in results)
 
+    # the pattern code of results, a base-3 integer with position i contributing its digit * 3**i
+    @staticmethod
+    def to_code(results: Sequence[CharResult]) -> int:
+        return encode(results)
+
+    # the results a pattern code stands for, shared between calls so they must not be modified
+    @staticmethod
+    def from_code(code: int, length: int) -> Tuple[CharResult, ...]:
+        return decode(code, length)
+
+
+_DIGITS = {CharResult.Gray: 0, CharResult.Yellow: 1, CharResult.Green: 2}
+_RESULTS = (CharResult.Gray, CharResult.Yellow, CharResult.Green)
+_GRAY, _YELLOW, _GREEN = 0, 1, 2
+
+
+def all_correct_code(length: int) -> int:
+    return 3**length - 1
+
+
+def encode(results: Sequence[CharResult]) -> int:
+    code = 0
+    for index in reversed(range(len(results))):
+        code = code * 3 + _DIGITS[results[index]]
+    return code
+
+
+@cache
+def decode(code: int, length: int) -> Tuple[CharResult, ...]:
+    results = list()
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        results.append(_RESULTS[digit])
+    return tuple(results)
+
+
+def score(guess: str, target: str) -> int:
+    code = 0
+    power = 1
+    unmatched: List[str] = list()
+    pending: List[Tuple[str, int]] = list()
+    for guessed, correct in zip(guess, target, strict=True):
+        if guessed == correct:
+            code += 2 * power
+        else:
+            unmatched.append(correct)
+            pending.append((guessed, power))
+        power *= 3
+
+    for guessed, power in pending:
+        if guessed in unmatched:
+            unmatched.remove(guessed)
+            code += power
 
-@dataclass()
+    return code
+
+
+def _positions(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# known_positions and known_not_positions are bitmasks, with bit i standing for index i
+@dataclass(frozen=True, slots=True)
 class Constraint:
     min_count: int
     min_is_exact: bool
-    known_positions: Set[int]
-    known_not_positions: Set[int]
-
-    def update(self, u: Constraint):
-        if u.min_count > self.min_count:
-            assert not self.min_is_exact
-            self.min_count = u.min_count
-            self.min_is_exact = u.min_is_exact
-        elif u.min_count == self.min_count:
-            self.min_is_exact = self.min_is_exact or u.min_is_exact
-        else:
-            assert not u.min_is_exact
-
-        self.known_positions.update(u.known_positions)
-        self.known_not_positions.update(u.known_not_positions)
-        assert self.known_positions.isdisjoint(self.known_not_positions)
+    known_positions: int
+    known_not_positions: int
 
     @staticmethod
     def merge(a: Constraint, b: Constraint) -> Constraint:
@@ -69,7 +123,7 @@ class Constraint:
 
         known_positions = a.known_positions | b.known_positions
         known_not_positions = a.known_not_positions | b.known_not_positions
-        assert known_positions.isdisjoint(known_not_positions)
+        assert not known_positions & known_not_positions
         return Constraint(
             min_count=min_count,
             min_is_exact=min_is_exact,
@@ -77,18 +131,36 @@ class Constraint:
             known_not_positions=known_not_positions,
         )
 
+    # why a and b can't both hold, so merging them would fail, if they can't
+    @staticmethod
+    def conflict(a: Constraint, b: Constraint) -> Optional[str]:
+        if a.min_count > b.min_count and b.min_is_exact or a.min_count < b.min_count and a.min_is_exact:
+            return f"count is both exactly {min(a.min_count, b.min_count)} and at least {max(a.min_count, b.min_count)}"
+        if (a.known_positions | b.known_positions) & (a.known_not_positions | b.known_not_positions):
+            return "a position is both known and known as wrong"
+        return None
+
     @staticmethod
     def from_result(indexes: Iterable[int], result: Sequence[CharResult]) -> Constraint:
-        char_results = Counter(result[index] for index in indexes)
+        return Constraint.from_code(indexes, encode(result))
 
-        min_count = char_results[CharResult.Green] + char_results[CharResult.Yellow]
-        min_is_exact = bool(char_results[CharResult.Gray])
-        known_positions = {
-            index for index in indexes if result[index] == CharResult.Green
-        }
-        known_not_positions = {
-            index for index in indexes if result[index] != CharResult.Green
-        }
+    # reads each index's digit straight out of the pattern code, so no results are decoded
+    @staticmethod
+    def from_code(indexes: Iterable[int], code: int) -> Constraint:
+        min_count = 0
+        min_is_exact = False
+        known_positions = 0
+        known_not_positions = 0
+        for index in indexes:
+            digit = code // 3**index % 3
+            if digit == _GRAY:
+                min_is_exact = True
+            else:
+                min_count += 1
+            if digit == _GREEN:
+                known_positions |= 1 << index
+            else:
+                known_not_positions |= 1 << index
 
         return Constraint(
             min_count=min_count,
@@ -97,10 +169,27 @@ class Constraint:
             known_not_positions=known_not_positions,
         )
 
+    # char_mask is the bitmask of the positions of char in guess
+    def is_satisfied(self, char_mask: int) -> bool:
+        count = char_mask.bit_count()
+        if count != self.min_count if self.min_is_exact else count < self.min_count:
+            return False
+        return char_mask & self.known_positions == self.known_positions and not char_mask & self.known_not_positions
 
-@cache
-def counter(word: str) -> Counter[str]:
-    return Counter(word)
+    def violation(self, char: str, guess: str, char_mask: int) -> Optional[str]:
+        count = char_mask.bit_count()
+        if self.min_is_exact and count != self.min_count:
+            return f"count of '{char}' in '{guess}' ({count}) does not match known count ({self.min_count})"
+        elif count < self.min_count:
+            return f"count of '{char}' in '{guess}' ({count}) does not meet minimum count ({self.min_count})"
+
+        for index in _positions(self.known_positions & ~char_mask):
+            return f"char {index} ('{guess[index]}') in '{guess}' does not match known char '{char}'"
+
+        for index in _positions(self.known_not_positions & char_mask):
+            return f"char {index} ('{guess[index]}') in '{guess}' is known as wrong"
+
+        return None
 
 
 @cache
@@ -111,98 +200,202 @@ def build_char_indexes(guess: str) -> Mapping[str, Collection[int]]:
     return char_indexes
 
 
+@cache
+def char_masks(word: str) -> Mapping[str, int]:
+    masks: Dict[str, int] = dict()
+    for index, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | 1 << index
+    return masks
+
+
+# the constraints a single guess and its pattern code set on each of its letters. a search plays the
+# same guesses against the same target over and over, so these are mostly shared
+@lru_cache(maxsize=8192)
+def _guess_constraints(guess: str, code: int) -> Tuple[Tuple[str, Constraint], ...]:
+    return tuple((char, Constraint.from_code(indexes, code)) for char, indexes in build_char_indexes(guess).items())
+
+
+# immutable (so copies are free) and hashable (so it can key caches) set of hard-mode constraints
+class ConstraintState:
+    __slots__ = ("_constraints", "_hash")
+
+    def __init__(self, constraints: Optional[Mapping[str, Constraint]] = None):
+        self._constraints: Dict[str, Constraint] = dict(constraints) if constraints else dict()
+        self._hash: Optional[int] = None
+
+    # wraps a dict nothing else holds without copying it, so each update copies the constraints once
+    @staticmethod
+    def _owning(constraints: Dict[str, Constraint]) -> ConstraintState:
+        state = ConstraintState.__new__(ConstraintState)
+        state._constraints = constraints
+        state._hash = None
+        return state
+
+    def update_code(self, guess: str, code: int) -> ConstraintState:
+        constraints = dict(self._constraints)
+        for char, new_constraint in _guess_constraints(guess, code):
+            old_constraint = constraints.get(char)
+            constraints[char] = Constraint.merge(old_constraint, new_constraint) if old_constraint else new_constraint
+        return ConstraintState._owning(constraints)
+
+    def update(self, guess: str, result: Sequence[CharResult]) -> ConstraintState:
+        return self.update_code(guess, encode(result))
+
+    # why the pattern code for guess contradicts these constraints, if it does, since update can't take it
+    def conflict(self, guess: str, code: int) -> Optional[str]:
+        for char, indexes in build_char_indexes(guess).items():
+            old_constraint = self._constraints.get(char)
+            if old_constraint is not None:
+                message = Constraint.conflict(old_constraint, Constraint.from_code(indexes, code))
+                if message is not None:
+                    return f"'{char}' in '{guess}' contradicts the earlier results: {message}"
+        return None
+
+    def is_legal(self, guess: str) -> bool:
+        masks = char_masks(guess)
+        for char, constraint in self._constraints.items():
+            if not constraint.is_satisfied(masks.get(char, 0)):
+                return False
+        return True
+
+    def violation(self, guess: str) -> Optional[str]:
+        masks = char_masks(guess)
+        for char, constraint in self._constraints.items():
+            message = constraint.violation(char, guess, masks.get(char, 0))
+            if message is not None:
+                return message
+        return None
+
+    def get(self, char: str) -> Optional[Constraint]:
+        return self._constraints.get(char)
+
+    def items(self) -> Iterable[Tuple[str, Constraint]]:
+        return self._constraints.items()
+
+    def __len__(self) -> int:
+        return len(self._constraints)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ConstraintState) and self._constraints == other._constraints
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._constraints.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"ConstraintState({self._constraints!r})"
+
+
 class Wordle:
-    def __init__(self, word: str, hard_mode: Optional[bool] = False):
+    def __init__(
+        self,
+        word: str,
+        hard_mode: Optional[bool] = False,
+        feedback: Optional[FeedbackMatrix] = None,
+        candidates: Optional[Iterable[str]] = None,
+    ):
         if not word:
             raise ValueError("cannot have empty word")
 
         self._hard_mode = bool(hard_mode)
         self._word = word
-        self._char_counts = counter(word)
-        self._constraints: Dict[str, Constraint] = dict()
+        self._feedback = feedback
+        self._all_correct = all_correct_code(len(word))
+        self._constraints = ConstraintState()
+        # the words still consistent with every result, narrowed from the survivors of the last guess
+        self._candidates: Optional[Tuple[str, ...]] = tuple(candidates) if candidates is not None else None
+        # the candidates' ids in the feedback matrix, when it holds the word and every candidate
+        self._candidate_ids: Optional[Tuple[int, ...]] = None
+        if self._candidates is not None and feedback is not None and word in feedback.index:
+            ids = tuple(feedback.index.get(candidate, -1) for candidate in self._candidates)
+            if -1 not in ids:
+                self._candidate_ids = ids
+
+    @property
+    def word(self) -> str:
+        return self._word
+
+    @property
+    def constraints(self) -> ConstraintState:
+        return self._constraints
+
+    @property
+    def tracks_candidates(self) -> bool:
+        return self._candidates is not None
+
+    def candidates(self) -> Tuple[str, ...]:
+        if self._candidates is None:
+            raise ValueError("this wordle was not given candidates to track")
+        return self._candidates
+
+    def candidate_count(self) -> int:
+        return len(self.candidates())
+
+    # narrows the candidates (and their ids) to those consistent with the constraints after guess
+    def _narrow(self, guess: str, constraints: ConstraintState) -> Tuple[Optional[Tuple[str, ...]], Optional[Tuple[int, ...]]]:
+        if self._candidates is None:
+            return None, None
+        if self._candidate_ids is not None:
+            assert self._feedback is not None
+            guess_id = self._feedback.index.get(guess)
+            if guess_id is not None:
+                # a survivor stays a candidate exactly when the guess scores the same against it as against the word
+                pattern = self._feedback.code(guess_id, self._feedback.index[self._word])
+                keep = [code == pattern for code in self._feedback.scores(guess_id, self._candidate_ids)]
+                return tuple(compress(self._candidates, keep)), tuple(compress(self._candidate_ids, keep))
+        keep = [constraints.is_legal(candidate) for candidate in self._candidates]
+        ids = tuple(compress(self._candidate_ids, keep)) if self._candidate_ids is not None else None
+        return tuple(compress(self._candidates, keep)), ids
 
     def is_legal(self, guess: str) -> bool:
-        char_counts = counter(guess)
         if len(guess) != len(self._word):
             return False
 
-        if self._hard_mode:
-            for char, constraint in self._constraints.items():
-                count = char_counts[char]
-                wrong_count = (
-                    count != constraint.min_count
-                    if constraint.min_is_exact
-                    else count < constraint.min_count
-                )
-                missing_known_positions = any(
-                    guess[index] != char for index in constraint.known_positions
-                )
-                present_known_not_positions = any(
-                    guess[index] == char for index in constraint.known_not_positions
-                )
-                if (
-                    wrong_count
-                    or missing_known_positions
-                    or present_known_not_positions
-                ):
-                    return False
+        if not self._hard_mode:
+            return True
+        return self._constraints.is_legal(guess)
 
-        return True
+    @property
+    def all_correct(self) -> int:
+        return self._all_correct
 
-    def _make_guess(self, guess: str) -> List[CharResult]:
+    # the pattern code guess gets against the word, without checking or recording the guess
+    def score(self, guess: str) -> int:
+        if self._feedback is not None:
+            code = self._feedback.get(guess, self._word)
+            if code is not None:
+                return code
+        return score(guess, self._word)
+
+    def _make_guess(self, guess: str) -> int:
         if not guess:
             raise ValueError("cannot guess empty word")
 
-        guess_char_counts = counter(guess)
-        self._verify_is_legal(guess, guess_char_counts)
-
-        result = [CharResult.Gray for _ in range(len(self._word))]
-        overlap = self._char_counts & guess_char_counts
+        self._verify_is_legal(guess)
+        return self.score(guess)
 
-        for index, (correct, guessed) in enumerate(zip(self._word, guess)):
-            if correct == guessed:
-                result[index] = CharResult.Green
-                overlap[correct] -= 1
+    def make_guess_code(self, guess: str) -> int:
+        code = self._make_guess(guess)
+        self._constraints = self._constraints.update_code(guess, code)
+        self._candidates, self._candidate_ids = self._narrow(guess, self._constraints)
+        return code
 
-        for index, (correct, guessed) in enumerate(zip(self._word, guess)):
-            if result[index] is not CharResult.Green and overlap[guessed]:
-                result[index] = CharResult.Yellow
-                overlap[guessed] -= 1
-
-        return result
+    def copy_make_guess_code(self, guess: str) -> Tuple[Wordle, int]:
+        code = self._make_guess(guess)
+        c = Wordle(self._word, self._hard_mode, self._feedback)
+        c._constraints = self._constraints.update_code(guess, code)
+        c._candidates, c._candidate_ids = self._narrow(guess, c._constraints)
+        return c, code
 
     def make_guess(self, guess: str) -> List[CharResult]:
-        result = self._make_guess(guess)
-        self._update_constraints(guess, result, mutate_inner=True)
-        return result
+        return list(decode(self.make_guess_code(guess), len(self._word)))
 
     def copy_make_guess(self, guess: str) -> Tuple[Wordle, List[CharResult]]:
-        result = self._make_guess(guess)
-        c = Wordle(self._word, self._hard_mode)
-        c._constraints = copy(self._constraints)
-        c._update_constraints(guess, result, mutate_inner=False)
-        return c, result
-
-    def _update_constraints(
-        self, guess: str, result: Sequence[CharResult], mutate_inner
-    ) -> None:
-        char_indexes = build_char_indexes(guess)
-
-        for char, indexes in char_indexes.items():
-            old_constraint = self._constraints.get(char)
-            new_constraint = Constraint.from_result(indexes, result)
-
-            if old_constraint:
-                if mutate_inner:
-                    old_constraint.update(new_constraint)
-                else:
-                    self._constraints[char] = Constraint.merge(
-                        old_constraint, new_constraint
-                    )
-            else:
-                self._constraints[char] = new_constraint
+        c, code = self.copy_make_guess_code(guess)
+        return c, list(decode(code, len(self._word)))
 
-    def _verify_is_legal(self, guess: str, char_counts: Counter[str]) -> None:
+    def _verify_is_legal(self, guess: str) -> None:
         if not guess:
             raise ValueError("cannot have an empty guess")
 
@@ -212,25 +405,6 @@ class Wordle:
             )
 
         if self._hard_mode:
-            for char, constraint in self._constraints.items():
-                count = char_counts[char]
-                if constraint.min_is_exact and count != constraint.min_count:
-                    raise ValueError(
-                        f"count of '{char}' in '{guess}' ({count}) does not match known count ({constraint.min_count})"
-                    )
-                elif count < constraint.min_count:
-                    raise ValueError(
-                        f"count of '{char}' in '{guess}' ({count}) does not meet minimum count ({constraint.min_count})"
-                    )
-
-                for index in constraint.known_positions:
-                    if guess[index] != char:
-                        raise ValueError(
-                            f"char {index} ('{guess[index]}') in '{guess}' does not match known char '{char}'"
-                        )
-
-                for index in constraint.known_not_positions:
-                    if guess[index] == char:
-                        raise ValueError(
-                            f"char {index} ('{guess[index]}') in '{guess}' is known as wrong"
-                        )
+            message = self._constraints.violation(guess)
+            if message is not None:
+                raise ValueError(message)